@@ -1,20 +1,81 @@
 from __future__ import annotations
 
+from bisect import bisect_left, insort
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional, Any, TYPE_CHECKING
+from typing import Iterable, Optional, Any, TYPE_CHECKING
+
+from exam_schedule import to_datetime
+from ring_buffer import TrendHistory
+from slot_events import ScheduleDiffer, SlotAppeared, SlotDisappeared, SlotEvent
 
 if TYPE_CHECKING:
     from infocar import InfoCarSession
     from config_manager import AppConfig
+    from history_store import HistoryStore
+    from notifications import Notifier
+    from poll_engine import PollEngine
 
 
 @dataclass
 class Stats:
     all_checks: int = 0
     earliest_ever_time: Optional[datetime] = None
+    # Earliest slot that is open right now
     current_earliest_time: Optional[datetime] = None
+    # Earliest of the slots that appeared most recently
     last_found_time: Optional[datetime] = None
+    open_slots: int = 0
+
+    # Date keys of every open slot, kept sorted so the earliest one is always at [0]
+    _open: dict[str, int] = field(default_factory=dict, repr=False)
+    _sorted_keys: list[int] = field(default_factory=list, repr=False)
+    # Earliest slot and open slot count over the session, for the trend sparklines
+    trend: TrendHistory = field(default_factory=TrendHistory, repr=False)
+
+    def apply(self, events: Iterable[SlotEvent]) -> None:
+        """Fold one poll's slot events into the stats; cost is proportional to the events."""
+        found: Optional[int] = None
+        added: list[int] = []
+
+        for event in events:
+            if isinstance(event, SlotAppeared):
+                old = self._open.get(event.id)
+                if old is not None:
+                    self._discard_key(old)
+                self._open[event.id] = event.key
+                added.append(event.key)
+                if found is None or event.key < found:
+                    found = event.key
+            elif isinstance(event, SlotDisappeared):
+                old = self._open.pop(event.id, None)
+                if old is not None:
+                    self._discard_key(old)
+
+        # A handful of new slots is cheaper to insert one by one, a first poll is cheaper to sort
+        if len(added) > 64:
+            self._sorted_keys.extend(added)
+            self._sorted_keys.sort()
+        else:
+            for key in added:
+                insort(self._sorted_keys, key)
+
+        self.open_slots = len(self._open)
+        self.current_earliest_time = to_datetime(self._sorted_keys[0]) if self._sorted_keys else None
+
+        if found is not None:
+            found_time = to_datetime(found)
+            self.last_found_time = found_time
+            if self.earliest_ever_time is None or found_time < self.earliest_ever_time:
+                self.earliest_ever_time = found_time
+
+    def sample_trend(self, now: Optional[float] = None) -> None:
+        self.trend.record(self._sorted_keys[0] if self._sorted_keys else None, self.open_slots, now)
+
+    def _discard_key(self, key: int) -> None:
+        i = bisect_left(self._sorted_keys, key)
+        if i < len(self._sorted_keys) and self._sorted_keys[i] == key:
+            del self._sorted_keys[i]
 
 
 @dataclass
@@ -23,7 +84,26 @@ class AppState:
     # Avoid runtime import cycle by using forward reference string for type hints
     session: Optional["InfoCarSession"] = None
     stats: Stats = field(default_factory=Stats)
+    # Previous schedule the stats were built from, shared so a re-login continues the stream
+    differ: ScheduleDiffer = field(default_factory=ScheduleDiffer)
     # Optional convenience holders
     reservation: Optional[dict[str, Any]] = None
     cfg: Optional["AppConfig"] = None
     started_checking_at: Optional[datetime] = None
+    # Where slot history goes, if enabled; stats are loaded from it on start
+    history: Optional["HistoryStore"] = None
+    # Built from cfg on login
+    notifier: Optional["Notifier"] = None
+    # The one poller of the app; only ever replaced through start_polling()
+    poll_engine: Optional["PollEngine"] = None
+
+    def start_polling(self, engine: "PollEngine") -> None:
+        """Stop whatever poller is running and start ``engine`` in its place."""
+        self.stop_polling()
+        self.poll_engine = engine
+        engine.start()
+
+    def stop_polling(self) -> None:
+        if self.poll_engine is not None:
+            self.poll_engine.stop()
+            self.poll_engine = None
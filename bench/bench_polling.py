@@ -0,0 +1,196 @@
+"""Benchmarks for the polling pipeline, run fully offline against ``bench.mock_server``.
+
+Run from the repository root::
+
+    python -m bench.bench_polling --days 60 --exams-per-hour 8 --iterations 50
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import inspect
+import json
+import statistics
+import time
+import tracemalloc
+from dataclasses import replace
+from pathlib import Path
+
+from bench.mock_server import MockConfig, MockInfoCarServer, generate_schedule
+from app_state import Stats
+from config_manager import AppConfig
+from exam_schedule import Schedule, ScheduleSet
+from infocar import InfoCarSession, PRACTICE_EXAM_TYPE
+from poll_engine import PollEngine
+from slot_filter import SlotFilter
+
+
+def summarize(samples: list[float]) -> dict:
+    samples = sorted(samples)
+    return {
+        "n": len(samples),
+        "min_ms": samples[0] * 1000,
+        "median_ms": statistics.median(samples) * 1000,
+        "mean_ms": statistics.fmean(samples) * 1000,
+        "p95_ms": samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000,
+    }
+
+
+async def measure(fn, iterations: int) -> dict:
+    """Time ``fn``, which may be a plain function or return an awaitable."""
+    async def call():
+        result = fn()
+        if inspect.isawaitable(result):
+            await result
+
+    await call()  # warm-up
+    samples = []
+    for _ in range(iterations):
+        gc.collect()
+        t0 = time.perf_counter()
+        await call()
+        samples.append(time.perf_counter() - t0)
+    return summarize(samples)
+
+
+async def mock_turnstile() -> str:
+    return "mock-turnstile"
+
+
+async def make_session(server: MockInfoCarServer) -> InfoCarSession:
+    session = InfoCarSession("mock-capmonster-key", base_url=server.url)
+    # The mock does not check Turnstile tokens, so never call CapMonster
+    session.solve_turnstile = mock_turnstile
+    await session.login("bench@example.com", "bench")
+    return session
+
+
+def cfg_for(window_days: int) -> AppConfig:
+    today = time.strftime("%Y-%m-%d")
+    last = time.strftime("%Y-%m-%d", time.localtime(time.time() + window_days * 86400))
+    return AppConfig(date_from=today, date_to=last, hour_from="07:00", hour_to="20:00")
+
+
+def make_engine(session: InfoCarSession, server: MockInfoCarServer, window_days: int) -> PollEngine:
+    return PollEngine(session, server.reservation(), SlotFilter.from_config(cfg_for(window_days)), Stats())
+
+
+async def run(config: MockConfig, iterations: int, window_days: int) -> dict:
+    results: dict = {"config": config.__dict__.copy(), "iterations": iterations}
+
+    payload = {"schedule": {"scheduledDays": generate_schedule(config)}}
+    slots = sum(len(h[PRACTICE_EXAM_TYPE]) for d in payload["schedule"]["scheduledDays"] for h in d["scheduledHours"])
+    results["slots"] = slots
+
+    results["parse_exams"] = await measure(lambda: Schedule.from_response(payload, PRACTICE_EXAM_TYPE), iterations)
+    results["parse_all_types"] = await measure(lambda: ScheduleSet.from_response(payload), iterations)
+
+    with MockInfoCarServer(config) as server:
+        session = await make_session(server)
+        word_id = server.reservation()["exam"]["organizationUnitId"]
+
+        def get_exams():
+            return session.get_exams(PRACTICE_EXAM_TYPE, word_id=word_id)
+
+        results["get_exams"] = await measure(get_exams, iterations)
+
+        engine = make_engine(session, server, window_days)
+        first_day, last_day = engine.slot_filter.span()
+
+        def get_exams_window():
+            return session.get_exams(PRACTICE_EXAM_TYPE, word_id=word_id, start_date=first_day, end_date=last_day)
+
+        results["get_exams_window"] = await measure(get_exams_window, iterations)
+
+        exams = await get_exams()
+
+        def process_initial():
+            engine.differ.previous = None
+            return engine.process(exams)
+
+        results["process_initial"] = await measure(process_initial, iterations)
+
+        # Two schedules one cancellation apart, processed alternately
+        server.churn()
+        alternate = [await get_exams(), exams]
+
+        def process_changed():
+            alternate.reverse()
+            return engine.process(alternate[0])
+
+        results["process_changed"] = await measure(process_changed, iterations)
+        results["process_unchanged"] = await measure(lambda: engine.process(exams), iterations)
+
+        # Worst case for matching: a window that no slot falls into
+        selective = SlotFilter.from_config(replace(cfg_for(window_days), hour_from="21:00", hour_to="22:00"))
+        results["match_selective"] = await measure(lambda: exams.earliest_matching(selective), iterations)
+
+        async def poll_iteration():
+            await engine.poll_once()
+
+        results["poll_iteration"] = await measure(poll_iteration, iterations)
+
+        async def poll_iteration_changed():
+            server.churn()
+            await poll_iteration()
+
+        results["poll_iteration_changed"] = await measure(poll_iteration_changed, iterations)
+
+        gc.collect()
+        tracemalloc.start()
+        baseline, _ = tracemalloc.get_traced_memory()
+        for _ in range(iterations):
+            await poll_iteration()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results["memory"] = {
+            "retained_kb": (current - baseline) / 1024,
+            "peak_kb": (peak - baseline) / 1024,
+        }
+        results["requests"] = dict(server.requests)
+        await session.aclose()
+
+    return results
+
+
+def print_results(results: dict) -> None:
+    print(f"slots per schedule: {results['slots']}  iterations: {results['iterations']}")
+    for name in (
+        "parse_exams", "parse_all_types", "get_exams", "get_exams_window", "process_initial", "process_changed", "process_unchanged",
+        "match_selective", "poll_iteration", "poll_iteration_changed",
+    ):
+        r = results[name]
+        print(f"{name:<22} median {r['median_ms']:9.3f} ms   p95 {r['p95_ms']:9.3f} ms   min {r['min_ms']:9.3f} ms")
+    mem = results["memory"]
+    print(f"{'memory':<22} retained {mem['retained_kb']:9.1f} KiB   peak {mem['peak_kb']:9.1f} KiB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the polling pipeline against the offline mock server.")
+    parser.add_argument("--days", type=int, default=MockConfig.days)
+    parser.add_argument("--hours-per-day", type=int, default=MockConfig.hours_per_day)
+    parser.add_argument("--exams-per-hour", type=int, default=MockConfig.exams_per_hour)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--no-etag", action="store_true", help="Make the mock ignore If-None-Match")
+    parser.add_argument("--window-days", type=int, default=30, help="Size of the searched date window")
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--json", type=Path, help="Write raw results to this file")
+    args = parser.parse_args()
+
+    config = MockConfig(
+        days=args.days,
+        hours_per_day=args.hours_per_day,
+        exams_per_hour=args.exams_per_hour,
+        latency=args.latency,
+        etag=not args.no_etag,
+    )
+    results = asyncio.run(run(config, args.iterations, args.window_days))
+    print_results(results)
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Replays a recorded cassette through the polling pipeline, fully offline.
+
+Record a real session first, then benchmark parsing, diffing, matching and stats on
+exactly that data::
+
+    python headless.py --dry-run --record session.jsonl.gz
+    python -m bench.bench_replay session.jsonl.gz
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from pathlib import Path
+
+from bench.bench_polling import cfg_for, summarize
+from app_state import Stats
+from cassette import CassetteError, CassettePlayer
+from infocar import InfoCarSession, RequestError
+from poll_engine import PollEngine
+from slot_filter import SlotFilter
+
+RESERVATIONS_PATH = "/api/word/reservations"
+SCHEDULE_PATH = "/api/word/word-centers/exam-schedule"
+
+
+async def run(path: Path, realtime: bool, window_days: int) -> dict:
+    player = CassettePlayer(path, realtime=realtime)
+    session = InfoCarSession("replay", cassette=player)
+    # Tokens are redacted in the cassette and never checked on replay
+    session.access_token = "replayed"
+
+    if not player.remaining("GET", RESERVATIONS_PATH):
+        raise CassetteError(f"{path} has no account reservations to replay")
+    reservation = (await session.get_account_reservations())[0]
+
+    engine = PollEngine(session, reservation, SlotFilter.from_config(cfg_for(window_days)), Stats())
+
+    samples = []
+    events = errors = matches = 0
+    started = time.perf_counter()
+    while player.remaining("PUT", SCHEDULE_PATH):
+        t0 = time.perf_counter()
+        try:
+            poll_events, exam = await engine.poll_once()
+        except RequestError:
+            errors += 1
+            continue
+        samples.append(time.perf_counter() - t0)
+        events += len(poll_events)
+        matches += exam is not None
+    elapsed = time.perf_counter() - started
+    await session.aclose()
+
+    schedule = session.metrics.endpoints.get("exam_schedule")
+    return {
+        "cassette": str(path),
+        "entries": player.entries,
+        "realtime": realtime,
+        "polls": len(samples),
+        "errors": errors,
+        "events": events,
+        "matches": matches,
+        "open_slots": engine.stats.open_slots,
+        "elapsed_s": elapsed,
+        "poll": summarize(samples) if samples else None,
+        "parse": {
+            "count": schedule.parse.count,
+            "mean_ms": (schedule.parse.mean() or 0) * 1000,
+        } if schedule is not None else None,
+    }
+
+
+def print_results(results: dict) -> None:
+    print(f"cassette: {results['cassette']}  entries: {results['entries']}  realtime: {results['realtime']}")
+    print(
+        f"polls: {results['polls']}  errors: {results['errors']}  events: {results['events']}  "
+        f"matches: {results['matches']}  open slots: {results['open_slots']}  elapsed: {results['elapsed_s']:.3f} s"
+    )
+    if results["poll"] is not None:
+        r = results["poll"]
+        print(f"{'poll_iteration':<22} median {r['median_ms']:9.3f} ms   p95 {r['p95_ms']:9.3f} ms   min {r['min_ms']:9.3f} ms")
+    if results["parse"] is not None:
+        print(f"{'parse':<22} mean   {results['parse']['mean_ms']:9.3f} ms   ({results['parse']['count']} responses)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay a recorded cassette through the polling pipeline.")
+    parser.add_argument("cassette", type=Path)
+    parser.add_argument("--realtime", action="store_true", help="Reproduce the recorded response times")
+    parser.add_argument("--window-days", type=int, default=30, help="Size of the searched date window")
+    parser.add_argument("--json", type=Path, help="Write raw results to this file")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.cassette, args.realtime, args.window_days))
+    print_results(results)
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""Start-up benchmark: import time of ``main`` and how long the TUI takes to draw and to log in.
+
+Every sample is a fresh interpreter, so nothing is already imported. The TUI runs headless
+in a scratch directory with a filled-in ``config.json``; auto-login is stopped as soon as it
+starts, so no network traffic happens. Run from the repository root::
+
+    python -m bench.bench_startup --runs 5
+    python -m bench.bench_startup --check   # exit 1 if a median is over bench/startup_budget.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+BUDGET_PATH = Path(__file__).resolve().parent / "startup_budget.json"
+
+# Runs in the child: prints wall-clock times of the first frame and of auto-login starting
+DRIVER = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+from main import InfoCarApp
+from screens.login_screen import LoginScreen
+
+marks = {{}}
+
+def mark(app, name):
+    marks.setdefault(name, time.time())
+    if len(marks) == 2:
+        app.exit()
+
+def action_login(self):
+    mark(self.app, "auto_login")
+
+LoginScreen.action_login = action_login
+
+class App(InfoCarApp):
+    def on_ready(self):
+        mark(self, "first_paint")
+
+App().run(headless=True)
+print(json.dumps(marks))
+"""
+
+
+def config_for_auto_login() -> dict:
+    today = date.today()
+    return {
+        "username": "bench@example.com",
+        "password": "bench",
+        "capmonster_key": "bench",
+        "date_from": today.isoformat(),
+        "date_to": (today + timedelta(days=30)).isoformat(),
+        "hour_from": "07:00",
+        "hour_to": "20:00",
+    }
+
+
+def parse_importtime(stderr: str, top: str = "main") -> dict[str, int]:
+    """Cumulative µs of ``top`` and of each module it imports directly, from ``-X importtime``.
+
+    Children are printed before their parent, so the direct imports of ``top`` are the
+    depth-1 lines since the previous top-level import (interpreter start-up comes first).
+    """
+    modules: dict[str, int] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        name = name.strip()
+        if depth == 0:
+            if name == top:
+                modules[name] = int(cumulative)
+                return modules
+            modules.clear()
+        elif depth == 1:
+            modules[name] = int(cumulative)
+    raise ValueError(f"{top} not found in -X importtime output")
+
+
+def import_sample() -> dict[str, int]:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    return parse_importtime(proc.stderr)
+
+
+def ui_sample(workdir: Path) -> dict[str, float]:
+    started = time.time()
+    proc = subprocess.run(
+        [sys.executable, "-c", DRIVER.format(root=str(ROOT))],
+        cwd=workdir, capture_output=True, text=True, check=True, timeout=60,
+    )
+    marks = json.loads(proc.stdout.strip().splitlines()[-1])
+    return {f"{name}_ms": (t - started) * 1000 for name, t in marks.items()}
+
+
+def run(runs: int) -> dict:
+    import_ms: list[float] = []
+    slowest: dict[str, list[float]] = {}
+    ui: dict[str, list[float]] = {}
+
+    import_sample()  # warm-up: compiles bytecode and fills the OS file cache
+    for _ in range(runs):
+        modules = import_sample()
+        import_ms.append(modules.pop("main") / 1000)
+        for name, cumulative in modules.items():
+            slowest.setdefault(name, []).append(cumulative / 1000)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        (workdir / "config.json").write_text(json.dumps(config_for_auto_login()), encoding="utf-8")
+        ui_sample(workdir)
+        for _ in range(runs):
+            for name, value in ui_sample(workdir).items():
+                ui.setdefault(name, []).append(value)
+
+    top = sorted(((statistics.median(v), k) for k, v in slowest.items()), reverse=True)[:10]
+    return {
+        "runs": runs,
+        "median": {
+            "import_main_ms": statistics.median(import_ms),
+            **{name: statistics.median(values) for name, values in ui.items()},
+        },
+        "samples": {"import_main_ms": import_ms, **ui},
+        "slowest_imports_ms": {name: ms for ms, name in top},
+    }
+
+
+def over_budget(values: dict, budget: dict) -> list[str]:
+    """One line per value above its limit in ``budget``; names carry their unit."""
+    return [
+        f"{name}: {values[name]:.1f} > {limit:.1f}"
+        for name, limit in budget.items()
+        if values.get(name, 0.0) > limit
+    ]
+
+
+def print_results(results: dict, budget: dict) -> None:
+    print(f"runs: {results['runs']} (medians; first paint and auto-login from process start)")
+    for name, value in results["median"].items():
+        limit = budget.get(name)
+        suffix = f"   budget {limit:8.1f} ms" if limit is not None else ""
+        print(f"{name:<22} {value:9.1f} ms{suffix}")
+    print("slowest imports of main (cumulative):")
+    for name, ms in results["slowest_imports_ms"].items():
+        print(f"  {name:<28} {ms:8.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark TUI start-up time.")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per measurement")
+    parser.add_argument("--budget", type=Path, default=BUDGET_PATH, help="JSON with a limit in ms per metric")
+    parser.add_argument("--check", action="store_true", help="Exit with status 1 if a median is over budget")
+    parser.add_argument("--json", type=Path, help="Write raw results to this file")
+    args = parser.parse_args()
+
+    budget = json.loads(args.budget.read_text(encoding="utf-8")) if args.budget.exists() else {}
+    results = run(args.runs)
+    print_results(results, budget)
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    failures = over_budget(results["median"], budget)
+    if failures:
+        print("over budget:\n  " + "\n  ".join(failures))
+        if args.check:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
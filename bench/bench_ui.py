@@ -0,0 +1,304 @@
+"""UI benchmark: drives ``InfoCarApp`` through the login, main and reschedule screens.
+
+Runs in Textual's headless pilot against ``FakeSession``, an offline stand-in for
+``InfoCarSession``, and measures:
+
+- ``full_frame``: repainting and encoding a whole screen after every widget is invalidated
+- ``frame``: each compositor refresh Textual actually performs while the app runs
+- ``update_panels``: the main screen's per-poll update, with and without changed stats
+- the spinner's render cost and rate, and CPU use while the main screen sits idle
+
+Run from the repository root::
+
+    python -m bench.bench_ui --idle 10
+    python -m bench.bench_ui --check   # exit 1 if a value is over bench/ui_budget.json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, replace
+from datetime import date, timedelta
+from pathlib import Path
+
+from textual.screen import Screen
+
+from bench.bench_polling import summarize
+from bench.bench_startup import over_budget
+from bench.mock_server import RESERVATION_ID, WORD_ID, MockConfig, generate_schedule
+from app_state import AppState
+from config_manager import AppConfig
+from exam_schedule import Schedule, ScheduleSet
+from main import InfoCarApp
+from metrics import Metrics
+from screens.login_screen import LoginScreen
+from screens.main_screen import MainScreen
+from screens.reschedule_screen import RescheduleScreen
+from widgets.spinner import Spinner
+
+BUDGET_PATH = Path(__file__).resolve().parent / "ui_budget.json"
+
+
+class FakeSession:
+    """Offline stand-in for ``InfoCarSession`` with the calls the screens make.
+
+    ``get_schedules`` returns the same ``ScheduleSet`` every time, like an unchanged
+    (304) response; logging in waits for ``login_gate`` so the login screen can be measured.
+    """
+
+    def __init__(self, config: MockConfig) -> None:
+        days = generate_schedule(config)
+        self.schedules = ScheduleSet.from_response({"organizationId": WORD_ID, "schedule": {"scheduledDays": days}})
+        self.reservation = {
+            "id": RESERVATION_ID,
+            "exam": {
+                "organizationUnitId": WORD_ID,
+                "organizationUnitName": "WORD Mock",
+                "practice": {"date": f"{days[-1]['day']}T12:00:00"},
+            },
+        }
+        self.metrics = Metrics()
+        self.turnstile_solve_count = 0
+        self.login_gate = asyncio.Event()
+        self.rescheduled: list[str] = []
+
+    async def get_capmonster_balance(self) -> float:
+        return 10.0
+
+    async def reconfigure(self, capmonster_key, proxies) -> None:
+        pass
+
+    async def login_or_resume(self, username, password) -> list[dict]:
+        await self.login_gate.wait()
+        return [self.reservation]
+
+    async def is_reschedule_enabled_for_word(self, word_id) -> bool:
+        return True
+
+    async def get_schedules(self, word_id, category="B", start_date=None, end_date=None) -> ScheduleSet:
+        return self.schedules
+
+    async def reschedule_exam(self, reservation_id, exam_id) -> None:
+        self.rescheduled.append(exam_id)
+
+    async def aclose(self) -> None:
+        pass
+
+
+class BenchApp(InfoCarApp):
+    def __init__(self, session: FakeSession) -> None:
+        super().__init__(history_path=None)
+        self.fake_session = session
+
+    # Textual also runs InfoCarApp.on_mount, which creates the AppState; the session is
+    # put in as it is assigned, so LoginScreen reuses it instead of creating a real one
+    @property
+    def state(self) -> AppState:
+        return self._state
+
+    @state.setter
+    def state(self, state: AppState) -> None:
+        state.session = self.fake_session
+        self._state = state
+
+
+@contextmanager
+def timed(cls, name: str, samples: list[float]):
+    """Append the duration of every call of ``cls.name`` to ``samples`` while active."""
+    original = getattr(cls, name)
+
+    def wrapper(self, *args, **kwargs):
+        t0 = time.perf_counter()
+        try:
+            return original(self, *args, **kwargs)
+        finally:
+            samples.append(time.perf_counter() - t0)
+
+    setattr(cls, name, wrapper)
+    try:
+        yield samples
+    finally:
+        setattr(cls, name, original)
+
+
+def full_frame(screen: Screen) -> float:
+    for widget in screen.walk_children(with_self=True):
+        widget.refresh()
+    t0 = time.perf_counter()
+    update = screen._compositor.render_update(full=True)
+    update.render_segments(screen.app.console)
+    return time.perf_counter() - t0
+
+
+def measure_full_frames(screen: Screen, iterations: int) -> dict:
+    full_frame(screen)  # warm-up
+    return summarize([full_frame(screen) for _ in range(iterations)])
+
+
+def measure_update_panels(screen: MainScreen, iterations: int, changed: bool) -> dict:
+    full = screen.engine.differ.previous
+    # Dropping the earliest slot changes every panel, like a poll that brings news
+    without_first = Schedule.from_columns(full.ids[1:], list(full.keys[1:]), list(full.places[1:]), full.amounts[1:])
+    samples = []
+    for i in range(iterations):
+        if changed:
+            screen.engine.process(without_first if i % 2 == 0 else full)
+        t0 = time.perf_counter()
+        screen.update_panels()
+        samples.append(time.perf_counter() - t0)
+    if changed and iterations % 2:
+        screen.engine.process(full)
+    return summarize(samples)
+
+
+async def wait_for(pilot, condition, timeout: float = 10.0) -> float:
+    """Let the app run until ``condition()`` holds; returns the time that took."""
+    t0 = time.perf_counter()
+    while not condition():
+        if time.perf_counter() - t0 > timeout:
+            raise TimeoutError("the app did not reach the expected state")
+        await pilot.pause(0.005)
+    return time.perf_counter() - t0
+
+
+def search_config() -> AppConfig:
+    today = date.today()
+    # The mock schedules exams from 07:00, so nothing matches until the hours are widened
+    return AppConfig(
+        username="bench@example.com",
+        password="bench",
+        capmonster_key="bench",
+        date_from=today.isoformat(),
+        date_to=(today + timedelta(days=30)).isoformat(),
+        hour_from="21:00",
+        hour_to="22:00",
+        notify_sound=False,
+    )
+
+
+async def run(config: MockConfig, iterations: int, idle_seconds: float, size: tuple[int, int]) -> dict:
+    cfg = search_config()
+    Path("config.json").write_text(json.dumps(asdict(cfg)), encoding="utf-8")
+
+    session = FakeSession(config)
+    app = BenchApp(session)
+    frames: list[float] = []
+    spinner: list[float] = []
+    results: dict = {"config": config.__dict__.copy(), "iterations": iterations, "size": list(size)}
+
+    with timed(Screen, "_compositor_refresh", frames), timed(Spinner, "render", spinner):
+        async with app.run_test(size=size) as pilot:
+            await wait_for(pilot, lambda: isinstance(app.screen, LoginScreen) and frames)
+            results["login_full_frame"] = measure_full_frames(app.screen, iterations)
+
+            session.login_gate.set()
+            # Until the main screen is mounted and has processed its first poll
+            results["login_to_main_ms"] = await wait_for(pilot, lambda: (
+                isinstance(app.screen, MainScreen)
+                and app.screen.engine is not None
+                and app.screen.engine.differ.previous is not None
+            )) * 1000
+            main_screen: MainScreen = app.screen
+            await pilot.pause(0.1)
+
+            results["main_full_frame"] = measure_full_frames(main_screen, iterations)
+            results["update_panels_unchanged"] = measure_update_panels(main_screen, iterations, changed=False)
+            results["update_panels_changed"] = measure_update_panels(main_screen, iterations, changed=True)
+            await pilot.pause(0.1)
+
+            frames.clear()
+            spinner.clear()
+            cpu0, wall0 = time.process_time(), time.perf_counter()
+            await asyncio.sleep(idle_seconds)
+            cpu, wall = time.process_time() - cpu0, time.perf_counter() - wall0
+            results["idle"] = {
+                "seconds": wall,
+                "cpu_percent": cpu / wall * 100,
+                "frames_per_s": len(frames) / wall,
+                "frame": summarize(frames) if frames else None,
+                "spinner_renders_per_s": len(spinner) / wall,
+                "spinner_render": summarize(spinner) if spinner else None,
+            }
+
+            # Widening the hours matches an open slot at once (see MainScreen.apply_config)
+            t0 = time.perf_counter()
+            main_screen.apply_config(replace(cfg, hour_from="07:00", hour_to="20:00"))
+            await wait_for(pilot, lambda: isinstance(app.screen, RescheduleScreen) and session.rescheduled)
+            results["match_to_rescheduled_ms"] = (time.perf_counter() - t0) * 1000
+            await pilot.pause(0.1)
+            results["reschedule_full_frame"] = measure_full_frames(app.screen, iterations)
+
+    results["summary"] = {
+        "main_full_frame_ms": results["main_full_frame"]["median_ms"],
+        "update_panels_changed_ms": results["update_panels_changed"]["median_ms"],
+        "idle_cpu_percent": results["idle"]["cpu_percent"],
+        "idle_frames_per_s": results["idle"]["frames_per_s"],
+    }
+    return results
+
+
+def print_results(results: dict, budget: dict) -> None:
+    print(f"terminal {results['size'][0]}x{results['size'][1]}  iterations: {results['iterations']}")
+    for name in ("login_full_frame", "main_full_frame", "reschedule_full_frame", "update_panels_unchanged", "update_panels_changed"):
+        r = results[name]
+        print(f"{name:<26} median {r['median_ms']:8.3f} ms   p95 {r['p95_ms']:8.3f} ms   min {r['min_ms']:8.3f} ms")
+    print(f"{'login_to_main':<26} {results['login_to_main_ms']:8.1f} ms")
+    print(f"{'match_to_rescheduled':<26} {results['match_to_rescheduled_ms']:8.1f} ms")
+
+    idle = results["idle"]
+    print(f"idle {idle['seconds']:.1f} s: cpu {idle['cpu_percent']:.1f} %   {idle['frames_per_s']:.1f} frames/s   "
+          f"{idle['spinner_renders_per_s']:.1f} spinner renders/s")
+    for name in ("frame", "spinner_render"):
+        r = idle[name]
+        if r is not None:
+            print(f"  {name:<24} median {r['median_ms']:8.3f} ms   p95 {r['p95_ms']:8.3f} ms")
+
+    for name, limit in budget.items():
+        print(f"{name:<26} {results['summary'][name]:8.2f}   budget {limit:8.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark screen rendering and update cost in the headless pilot.")
+    parser.add_argument("--days", type=int, default=60)
+    parser.add_argument("--exams-per-hour", type=int, default=4)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--idle", type=float, default=5.0, help="Seconds to measure the idle main screen")
+    parser.add_argument("--width", type=int, default=100)
+    parser.add_argument("--height", type=int, default=40)
+    parser.add_argument("--budget", type=Path, default=BUDGET_PATH, help="JSON with a limit per summary value")
+    parser.add_argument("--check", action="store_true", help="Exit with status 1 if a summary value is over budget")
+    parser.add_argument("--json", type=Path, help="Write raw results to this file")
+    args = parser.parse_args()
+
+    config = MockConfig(days=args.days, exams_per_hour=args.exams_per_hour)
+    budget = json.loads(args.budget.read_text(encoding="utf-8")) if args.budget.exists() else {}
+    json_path = args.json.resolve() if args.json else None
+
+    # config.json, the token cache and the like land in a scratch directory
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            results = asyncio.run(run(config, args.iterations, args.idle, (args.width, args.height)))
+        finally:
+            os.chdir(cwd)
+    print_results(results, budget)
+
+    if json_path:
+        json_path.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    failures = over_budget(results["summary"], budget)
+    if failures:
+        print("over budget:\n  " + "\n  ".join(failures))
+        if args.check:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
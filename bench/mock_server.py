@@ -0,0 +1,310 @@
+from __future__ import annotations
+
+import argparse
+import base64
+import hashlib
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+RESERVATION_ID = "mock-reservation"
+WORD_ID = "3"
+
+
+@dataclass
+class MockConfig:
+    days: int = 60            # how many days ahead the synthetic schedule covers
+    hours_per_day: int = 10   # scheduled hours per day, starting at 07:00
+    exams_per_hour: int = 4   # practice exams per scheduled hour
+    theory_per_hour: int = 1  # theory exams per scheduled hour
+    latency: float = 0.0      # seconds added to every response
+    error_rate: float = 0.0   # fraction of schedule requests answered with an error
+    churn_rate: float = 0.0   # fraction of schedule requests preceded by one slot being replaced
+    etag: bool = True         # answer If-None-Match with 304 Not Modified
+    seed: int = 1
+
+
+def make_token(lifetime: int = 3600) -> str:
+    """Build an unsigned JWT shaped like the one issued by Info-Car."""
+    def b64(obj) -> str:
+        raw = json.dumps(obj, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+    return ".".join([
+        b64({"alg": "none", "typ": "JWT"}),
+        b64({"sub": "mock", "exp": int(time.time()) + lifetime}),
+        "mock-signature",
+    ])
+
+
+def generate_schedule(cfg: MockConfig, start: datetime | None = None) -> list[dict]:
+    """Generate the ``scheduledDays`` list of a synthetic exam-schedule response."""
+    rnd = random.Random(cfg.seed)
+    start = (start or datetime.now()).replace(hour=0, minute=0, second=0, microsecond=0)
+
+    def exams(count: int, date: str, amount: int) -> list[dict]:
+        return [
+            {
+                "id": "%032x" % rnd.getrandbits(128),
+                "places": rnd.randint(1, 4),
+                "date": date,
+                "amount": amount,
+                "additionalInfo": None,
+            }
+            for _ in range(count)
+        ]
+
+    days = []
+    for d in range(cfg.days):
+        day = start + timedelta(days=d)
+        hours = []
+        for h in range(cfg.hours_per_day):
+            slot = day + timedelta(hours=7 + h)
+            date = slot.strftime("%Y-%m-%dT%H:%M:%S")
+            hours.append({
+                "time": slot.strftime("%H:%M:%S"),
+                "theoryExams": exams(cfg.theory_per_hour, date, 50),
+                "practiceExams": exams(cfg.exams_per_hour, date, 200),
+                "linkedExamsDto": [],
+            })
+        days.append({"day": day.strftime("%Y-%m-%d"), "scheduledHours": hours})
+    return days
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "MockInfoCarServer"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def _send(self, status: int, body: bytes = b"", content_type: str = "application/json", headers: dict | None = None) -> None:
+        if self.server.config.latency > 0:
+            time.sleep(self.server.config.latency)
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, obj, status: int = 200) -> None:
+        self._send(status, json.dumps(obj).encode())
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _authorized(self) -> bool:
+        if self.headers.get("Authorization") == f"Bearer {self.server.token}":
+            return True
+        self._send(401, b'{"error":"unauthorized"}')
+        return False
+
+    def do_GET(self) -> None:
+        path = urlparse(self.path).path
+        self.server.count(path)
+
+        if path == "/oauth2/login":
+            html = '<form method="post"><input type="hidden" name="_csrf" value="mock-csrf"/></form>'
+            self._send(200, html.encode(), "text/html")
+        elif path == "/oauth2/authorize":
+            location = f"https://info-car.pl/new/assets/refresh.html#access_token={self.server.token}&token_type=bearer"
+            self._send(302, headers={"Location": location})
+        elif path.startswith("/api/word/word-centers/reschedule-enabled/"):
+            if self._authorized():
+                self._send_json({"rescheduleEnabled": True})
+        elif path == "/api/word/reservations":
+            if self._authorized():
+                self._send_json({"items": [self.server.reservation()]})
+        else:
+            self._send(404, b'{"error":"not found"}')
+
+    def do_POST(self) -> None:
+        path = urlparse(self.path).path
+        self.server.count(path)
+        body = self._read_body()
+
+        if path == "/oauth2/login":
+            ok = b"password=" in body and b"_csrf=mock-csrf" in body
+            location = "/oauth2/authorize" if ok else "/oauth2/login?error=failure"
+            self._send(302, headers={"Location": location})
+        elif path == "/webhook":
+            # Stand-in target for notifications.WebhookSink
+            self.server.webhooks.append(json.loads(body or b"{}"))
+            self._send(204)
+        else:
+            self._send(404, b'{"error":"not found"}')
+
+    def do_PUT(self) -> None:
+        path = urlparse(self.path).path
+        self.server.count(path)
+        body = self._read_body()
+
+        if path == "/api/word/word-centers/exam-schedule":
+            if not self._authorized():
+                return
+            if self.server.config.error_rate > 0 and self.server.random.random() < self.server.config.error_rate:
+                kind = self.server.random.random()
+                if kind < 1 / 3:
+                    self._send(200, b"<html><body>Request Rejected</body></html>", "text/html")
+                elif kind < 2 / 3:
+                    self._send(429, b'{"error":"too many requests"}', headers={"Retry-After": "5"})
+                else:
+                    self._send(500, b'{"error":"internal"}')
+                return
+            if self.server.config.churn_rate > 0 and self.server.random.random() < self.server.config.churn_rate:
+                self.server.churn()
+            req = json.loads(body or b"{}")
+            body, etag = self.server.schedule_body(req.get("startDate", ""), req.get("endDate", ""))
+            if self.server.config.etag and self.headers.get("If-None-Match") == etag:
+                self._send(304, headers={"ETag": etag})
+            elif self.server.config.etag:
+                self._send(200, body, headers={"ETag": etag})
+            else:
+                self._send(200, body)
+        elif path.startswith("/api/word/reservations/") and path.endswith("/reschedule"):
+            if self._authorized():
+                self.server.rescheduled.append(json.loads(body or b"{}").get("updatedPracticeId"))
+                self._send_json({})
+        else:
+            self._send(404, b'{"error":"not found"}')
+
+
+class MockInfoCarServer(ThreadingHTTPServer):
+    """Local stand-in for the Info-Car endpoints used by ``InfoCarSession``.
+
+    Usage::
+
+        with MockInfoCarServer(MockConfig(days=60)) as server:
+            session = InfoCarSession("key", base_url=server.url)
+    """
+
+    daemon_threads = True
+
+    def __init__(self, config: MockConfig | None = None, host: str = "127.0.0.1", port: int = 0) -> None:
+        super().__init__((host, port), _Handler)
+        self.config = config or MockConfig()
+        # Separate stream from generate_schedule, otherwise churn() would reissue existing ids
+        self.random = random.Random(self.config.seed + 1)
+        self.token = make_token()
+        self.requests: dict[str, int] = {}
+        self.rescheduled: list[str] = []
+        self.webhooks: list[dict] = []
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self.set_schedule(generate_schedule(self.config))
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def set_schedule(self, scheduled_days: list[dict]) -> None:
+        with self._lock:
+            self.scheduled_days = scheduled_days
+            self._bodies: dict[tuple[str, str], tuple[bytes, str]] = {}
+
+    def schedule_body(self, start: str, end: str) -> tuple[bytes, str]:
+        """Serialized schedule between two ISO dates and its ETag."""
+        # Both dates are instants: exams from startDate up to (not at) endDate are served.
+        # Every mock exam is after 00:00, so that is the days in [startDate, endDate)
+        key = (start[:10], end[:10])
+        with self._lock:
+            cached = self._bodies.get(key)
+            if cached is None:
+                days = [
+                    d for d in self.scheduled_days
+                    if (not key[0] or d["day"] >= key[0]) and (not key[1] or d["day"] < key[1])
+                ]
+                body = json.dumps({"organizationId": WORD_ID, "schedule": {"scheduledDays": days}}).encode()
+                cached = self._bodies[key] = (body, '"%s"' % hashlib.blake2b(body, digest_size=8).hexdigest())
+            return cached
+
+    def churn(self, count: int = 1) -> None:
+        """Replace ``count`` random practice exams with new ones, as cancellations and bookings do."""
+        with self._lock:
+            hours = [h for d in self.scheduled_days for h in d["scheduledHours"] if h["practiceExams"]]
+            for _ in range(count):
+                if not hours:
+                    break
+                exams = self.random.choice(hours)["practiceExams"]
+                old = exams.pop(self.random.randrange(len(exams)))
+                exams.append({**old, "id": "%032x" % self.random.getrandbits(128)})
+            self._bodies = {}
+
+    def reservation(self) -> dict:
+        last_day = self.scheduled_days[-1]["day"] if self.scheduled_days else datetime.now().strftime("%Y-%m-%d")
+        return {
+            "id": RESERVATION_ID,
+            "exam": {
+                "organizationUnitId": WORD_ID,
+                "organizationUnitName": "WORD Mock",
+                "practice": {"date": f"{last_day}T12:00:00"},
+            },
+        }
+
+    def count(self, path: str) -> None:
+        with self._lock:
+            self.requests[path] = self.requests.get(path, 0) + 1
+
+    def start(self) -> "MockInfoCarServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "MockInfoCarServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run an offline stand-in for the Info-Car API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--days", type=int, default=MockConfig.days)
+    parser.add_argument("--hours-per-day", type=int, default=MockConfig.hours_per_day)
+    parser.add_argument("--exams-per-hour", type=int, default=MockConfig.exams_per_hour)
+    parser.add_argument("--latency", type=float, default=MockConfig.latency)
+    parser.add_argument("--error-rate", type=float, default=MockConfig.error_rate)
+    parser.add_argument("--churn-rate", type=float, default=MockConfig.churn_rate)
+    parser.add_argument("--no-etag", action="store_true", help="Never answer 304 Not Modified")
+    parser.add_argument("--seed", type=int, default=MockConfig.seed)
+    args = parser.parse_args()
+
+    config = MockConfig(
+        days=args.days,
+        hours_per_day=args.hours_per_day,
+        exams_per_hour=args.exams_per_hour,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        churn_rate=args.churn_rate,
+        etag=not args.no_etag,
+        seed=args.seed,
+    )
+    server = MockInfoCarServer(config, host=args.host, port=args.port)
+    print(f"Mock Info-Car listening on {server.url} (webhook stand-in: {server.url}/webhook)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+"""Record Info-Car traffic to a cassette file and replay it offline.
+
+A cassette is JSON lines (gzip-compressed when the name ends in ``.gz``): one header
+line, then one line per request/response pair. Credentials, tokens, the login page's CSRF
+value and all reservation fields the client does not read (names, contact details and the
+like) are redacted before anything is written, so a cassette can be shared for benchmarks
+and bug reports. Exam schedules are kept as they are.
+
+Both sides plug into ``InfoCarSession(cassette=...)`` as httpx transports::
+
+    recorder = CassetteRecorder(Path("session.jsonl.gz"))      # live traffic, also written to disk
+    player = CassettePlayer(Path("session.jsonl.gz"))          # no network at all
+"""
+from __future__ import annotations
+
+import asyncio
+import base64
+import gzip
+import json
+import re
+import time
+from collections import deque
+from pathlib import Path
+from typing import IO, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import httpx
+
+CASSETTE_VERSION = 1
+
+REDACTED = "REDACTED"
+
+REDACTED_REQUEST_HEADERS = {"authorization", "x-cf-turnstile", "cookie"}
+REDACTED_FORM_FIELDS = {"username", "password", "_csrf"}
+_TOKEN_PARAM = re.compile(r"\b(access_token|id_token)=[^&#]*")
+# Hidden CSRF input of the login page, in the shape InfoCarSession.login looks for
+_CSRF_INPUT = re.compile(r"""(name=["']_csrf["']\s+value=["'])[^"']+""")
+RESERVATIONS_PATH = "/api/word/reservations"
+# What the client reads from reservation payloads; everything else (names, contact
+# details, document numbers) is left out of cassettes
+_RESERVATION_FIELDS = {
+    "id": None,
+    "exam": {"organizationUnitId": None, "organizationUnitName": None, "practice": {"date": None}},
+}
+# Decoded bodies are stored, so headers describing the wire encoding would be wrong on replay
+_DROPPED_RESPONSE_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+class CassetteError(Exception):
+    pass
+
+
+def _open(path: Path, mode: str) -> IO[str]:
+    if path.suffix == ".gz":
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return path.open(mode, encoding="utf-8")
+
+
+def _redact_url(url: str) -> str:
+    return _TOKEN_PARAM.sub(lambda m: f"{m.group(1)}={REDACTED}", url)
+
+
+def _redact_body(body: bytes, content_type: str) -> bytes:
+    if "application/x-www-form-urlencoded" not in content_type:
+        return body
+    fields = [
+        (k, REDACTED if k in REDACTED_FORM_FIELDS else v)
+        for k, v in parse_qsl(body.decode("utf-8", "replace"), keep_blank_values=True)
+    ]
+    return urlencode(fields).encode()
+
+
+def _keep(obj, fields):
+    """``obj`` with only the dict keys in ``fields`` (nested the same way); None keeps a value whole."""
+    if fields is None:
+        return obj
+    if isinstance(obj, list):
+        return [_keep(item, fields) for item in obj]
+    if isinstance(obj, dict):
+        return {k: _keep(v, fields[k]) for k, v in obj.items() if k in fields}
+    return obj
+
+
+def _redact_response_body(url: str, body: bytes, content_type: str) -> bytes:
+    if "html" in content_type:
+        text = body.decode("utf-8", "replace")
+        return _CSRF_INPUT.sub(lambda m: m.group(1) + REDACTED, text).encode("utf-8")
+    if urlsplit(url).path.startswith(RESERVATIONS_PATH):
+        # The list ({"items": [...]}) and the reschedule answer both carry account data
+        try:
+            data = json.loads(body)
+        except ValueError:
+            return REDACTED.encode()
+        return json.dumps(_keep(data, {"items": _RESERVATION_FIELDS, **_RESERVATION_FIELDS})).encode()
+    return body
+
+
+def _redact_response_header(name: str, value: str) -> str:
+    lname = name.lower()
+    if lname == "set-cookie":
+        return value.split("=", 1)[0] + "=" + REDACTED
+    if lname == "location":
+        return _redact_url(value)
+    return value
+
+
+def _encode_body(body: bytes) -> dict:
+    try:
+        return {"body": body.decode("utf-8")}
+    except UnicodeDecodeError:
+        return {"body_b64": base64.b64encode(body).decode("ascii")}
+
+
+def _decode_body(entry: dict) -> bytes:
+    if "body_b64" in entry:
+        return base64.b64decode(entry["body_b64"])
+    return entry.get("body", "").encode("utf-8")
+
+
+def _key(method: str, url: str) -> tuple[str, str]:
+    # Query strings and bodies carry dates and ids that differ between runs, so only
+    # the method and path identify a request
+    return method.upper(), urlsplit(url).path
+
+
+class _RecordingTransport(httpx.AsyncBaseTransport):
+    def __init__(self, inner: httpx.AsyncBaseTransport, recorder: "CassetteRecorder") -> None:
+        self.inner = inner
+        self.recorder = recorder
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        t0 = time.perf_counter()
+        response = await self.inner.handle_async_request(request)
+        try:
+            body = await response.aread()
+        finally:
+            await response.aclose()
+        duration = time.perf_counter() - t0
+
+        headers = [(k, v) for k, v in response.headers.multi_items() if k.lower() not in _DROPPED_RESPONSE_HEADERS]
+        self.recorder.write(request, response.status_code, headers, body, duration)
+        return httpx.Response(response.status_code, headers=headers, content=body, request=request)
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+
+
+class CassetteRecorder:
+    """Passes requests through to the network and appends each exchange to ``path``."""
+
+    replaying = False
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.started = time.perf_counter()
+        self._file: Optional[IO[str]] = _open(self.path, "w")
+        self._file.write(json.dumps({"version": CASSETTE_VERSION, "recorded_at": time.time()}) + "\n")
+
+    def transport(self, inner: httpx.AsyncBaseTransport) -> httpx.AsyncBaseTransport:
+        return _RecordingTransport(inner, self)
+
+    def write(self, request: httpx.Request, status: int, headers: list[tuple[str, str]], body: bytes, duration: float) -> None:
+        if self._file is None:
+            return
+        content_type = next((v for k, v in headers if k.lower() == "content-type"), "")
+        entry = {
+            "t": round(time.perf_counter() - self.started - duration, 4),
+            "duration": round(duration, 4),
+            "method": request.method,
+            "url": _redact_url(str(request.url)),
+            "request_headers": {
+                k: REDACTED if k.lower() in REDACTED_REQUEST_HEADERS else v
+                for k, v in request.headers.items()
+            },
+            "request_body": _redact_body(request.content, request.headers.get("Content-Type", "")).decode("utf-8", "replace"),
+            "status": status,
+            "headers": [[k, _redact_response_header(k, v)] for k, v in headers],
+            **_encode_body(_redact_response_body(str(request.url), body, content_type)),
+        }
+        self._file.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class _ReplayTransport(httpx.AsyncBaseTransport):
+    def __init__(self, player: "CassettePlayer") -> None:
+        self.player = player
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        entry = self.player.next(request.method, str(request.url))
+        if self.player.realtime:
+            await asyncio.sleep(entry["duration"])
+        return httpx.Response(
+            entry["status"],
+            headers=[tuple(h) for h in entry["headers"]],
+            content=_decode_body(entry),
+            request=request,
+        )
+
+
+class CassettePlayer:
+    """Answers requests from a recorded cassette, without touching the network.
+
+    Each request gets the next unused recording with the same method and path. With
+    ``realtime`` every response takes as long as it originally did; otherwise responses
+    come back immediately.
+    """
+
+    replaying = True
+
+    def __init__(self, path: Path, realtime: bool = False) -> None:
+        self.path = Path(path)
+        self.realtime = realtime
+        self._queues: dict[tuple[str, str], deque] = {}
+        self.entries = 0
+
+        with _open(self.path, "r") as f:
+            header = json.loads(f.readline() or "{}")
+            if header.get("version") != CASSETTE_VERSION:
+                raise CassetteError(f"{self.path} is not a version {CASSETTE_VERSION} cassette")
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                self._queues.setdefault(_key(entry["method"], entry["url"]), deque()).append(entry)
+                self.entries += 1
+
+    def transport(self, inner: Optional[httpx.AsyncBaseTransport] = None) -> httpx.AsyncBaseTransport:
+        return _ReplayTransport(self)
+
+    def remaining(self, method: str, url: str) -> int:
+        queue = self._queues.get(_key(method, url))
+        return len(queue) if queue else 0
+
+    def next(self, method: str, url: str) -> dict:
+        queue = self._queues.get(_key(method, url))
+        if not queue:
+            raise CassetteError(f"No more recorded responses for {method} {urlsplit(url).path}")
+        return queue.popleft()
+
+    def close(self) -> None:
+        pass
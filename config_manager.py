@@ -1,9 +1,13 @@
 import json
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 from pathlib import Path
 from typing import Optional
 
+from slot_filter import SlotFilter
+
 CONFIG_PATH = Path("config.json")
+# How often a running poller looks for edits to config.json, in seconds
+CONFIG_WATCH_INTERVAL = 5.0
 
 @dataclass
 class AppConfig:
@@ -14,25 +18,104 @@ class AppConfig:
     date_to: str = ""    # YYYY-MM-DD
     hour_from: str = ""  # HH:MM
     hour_to: str = ""    # HH:MM
+    # Optional extra preferences, only editable in config.json
+    date_ranges: list[list[str]] = field(default_factory=list)            # [["YYYY-MM-DD", "YYYY-MM-DD"], ...]
+    weekday_hours: dict[str, list[list[str]]] = field(default_factory=dict)  # {"sat": [["HH:MM", "HH:MM"]], ...}
+    excluded_dates: list[str] = field(default_factory=list)               # ["YYYY-MM-DD", ...]
+    # Notifications, see notifications.py
+    notify_sound: bool = True
+    notify_bell: bool = False
+    notify_desktop: bool = False
+    notify_webhook: str = ""  # URL that gets a JSON POST per notification
+
+def config_from_dict(data: dict) -> AppConfig:
+    if not isinstance(data, dict):
+        raise ValueError("config.json must contain a JSON object")
+    return AppConfig(
+        username=data.get("username", ""),
+        password=data.get("password", ""),
+        capmonster_key=data.get("capmonster_key", ""),
+        date_from=data.get("date_from", ""),
+        date_to=data.get("date_to", ""),
+        hour_from=data.get("hour_from", ""),
+        hour_to=data.get("hour_to", ""),
+        date_ranges=data.get("date_ranges", []),
+        weekday_hours=data.get("weekday_hours", {}),
+        excluded_dates=data.get("excluded_dates", []),
+        notify_sound=data.get("notify_sound", True),
+        notify_bell=data.get("notify_bell", False),
+        notify_desktop=data.get("notify_desktop", False),
+        notify_webhook=data.get("notify_webhook", ""),
+    )
 
 def load_config(path: Optional[Path] = None) -> AppConfig:
     p = path or CONFIG_PATH
     if not p.exists():
         return AppConfig()
     try:
-        data = json.loads(p.read_text(encoding="utf-8"))
-        return AppConfig(
-            username=data.get("username", ""),
-            password=data.get("password", ""),
-            capmonster_key=data.get("capmonster_key", ""),
-            date_from=data.get("date_from", ""),
-            date_to=data.get("date_to", ""),
-            hour_from=data.get("hour_from", ""),
-            hour_to=data.get("hour_to", ""),
-        )
+        return config_from_dict(json.loads(p.read_text(encoding="utf-8")))
     except Exception:
         return AppConfig()
 
+def _is_pair_list(value) -> bool:
+    """True for a list of two-string lists, like ``[["07:00", "12:00"], ...]``."""
+    return isinstance(value, list) and all(
+        isinstance(pair, list) and len(pair) == 2 and all(isinstance(v, str) for v in pair)
+        for pair in value
+    )
+
+def validate_config(cfg: AppConfig) -> None:
+    """Raise ValueError if the search preferences of ``cfg`` cannot be used for polling."""
+    for name in ("date_from", "date_to", "hour_from", "hour_to"):
+        if not isinstance(getattr(cfg, name), str):
+            raise ValueError(f"{name} must be a string")
+    if not _is_pair_list(cfg.date_ranges):
+        raise ValueError('date_ranges must be a list of ["YYYY-MM-DD", "YYYY-MM-DD"] pairs')
+    if not isinstance(cfg.weekday_hours, dict) or not all(
+        windows is None or _is_pair_list(windows) for windows in cfg.weekday_hours.values()
+    ):
+        raise ValueError('weekday_hours must map weekdays to lists of ["HH:MM", "HH:MM"] pairs')
+    if not isinstance(cfg.excluded_dates, list) or not all(isinstance(d, str) for d in cfg.excluded_dates):
+        raise ValueError('excluded_dates must be a list of "YYYY-MM-DD" strings')
+    try:
+        SlotFilter.from_config(cfg)
+    except TypeError as e:
+        raise ValueError(str(e)) from e
+
+class ConfigWatcher:
+    """Notices edits to config.json by comparing its modification time and size on every ``poll``."""
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = path or CONFIG_PATH
+        self._signature = self._stat()
+
+    def _stat(self) -> Optional[tuple[int, int]]:
+        try:
+            st = self.path.stat()
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def poll(self) -> Optional[AppConfig]:
+        """Return the new config if the file changed since the last call, otherwise None.
+
+        Raises ValueError if the changed file cannot be parsed or fails ``validate_config``;
+        each edit is reported once, and a removed file is ignored.
+        """
+        signature = self._stat()
+        if signature == self._signature:
+            return None
+        self._signature = signature
+        if signature is None:
+            return None
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            raise ValueError(f"Cannot read {self.path}: {e}") from e
+        cfg = config_from_dict(data)
+        validate_config(cfg)
+        return cfg
+
 def save_config(cfg: AppConfig, path: Optional[Path] = None) -> None:
     p = path or CONFIG_PATH
     p.write_text(json.dumps(asdict(cfg), indent=2, ensure_ascii=False), encoding="utf-8")
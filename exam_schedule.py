@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Iterator, Optional
+
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_ORDINAL = _EPOCH.toordinal()
+
+THEORY_EXAM_TYPE = 'theoryExams'
+PRACTICE_EXAM_TYPE = 'practiceExams'
+EXAM_TYPES = (THEORY_EXAM_TYPE, PRACTICE_EXAM_TYPE)
+
+
+@dataclass
+class Exam:
+    id: str
+    places: int
+    dateStr: str
+    date: datetime
+    amount: int
+
+
+def parse_timestamp(s: str) -> int:
+    """Parse a fixed-format 'YYYY-MM-DDTHH:MM:SS' string into seconds since 1970-01-01 (naive)."""
+    if len(s) != 19 or s[4] != "-" or s[10] != "T":
+        return to_key(datetime.strptime(s, "%Y-%m-%dT%H:%M:%S"))
+    days = date(int(s[0:4]), int(s[5:7]), int(s[8:10])).toordinal() - _EPOCH_ORDINAL
+    return days * 86400 + int(s[11:13]) * 3600 + int(s[14:16]) * 60 + int(s[17:19])
+
+
+def to_key(dt: datetime) -> int:
+    """Convert a naive datetime to the integer key used by Schedule."""
+    return (dt.toordinal() - _EPOCH_ORDINAL) * 86400 + dt.hour * 3600 + dt.minute * 60 + dt.second
+
+
+def to_datetime(key: int) -> datetime:
+    return _EPOCH + timedelta(seconds=key)
+
+
+class Schedule:
+    """Exam slots of one type, stored column-wise and sorted by date.
+
+    Slots are only turned into ``Exam`` objects when asked for, so a poll that just
+    needs the earliest slot does not pay for thousands of dataclass instances.
+    """
+
+    __slots__ = ("ids", "keys", "places", "amounts", "_index")
+
+    def __init__(self) -> None:
+        self.ids: list[str] = []
+        self.keys = array("q")
+        self.places = array("i")
+        self.amounts: list[int] = []
+        self._index: Optional[dict[str, int]] = None
+
+    @classmethod
+    def from_response(cls, data: dict, exam_type: str) -> "Schedule":
+        """Build a schedule of one exam type from an exam-schedule response body."""
+        return ScheduleSet.from_response(data, (exam_type,)).of(exam_type)
+
+    @classmethod
+    def from_columns(cls, ids: list[str], keys: list[int], places: list[int], amounts: list[int]) -> "Schedule":
+        # The API returns days in order already, sorting only kicks in if it ever does not
+        if any(keys[i] > keys[i + 1] for i in range(len(keys) - 1)):
+            order = sorted(range(len(keys)), key=keys.__getitem__)
+            ids = [ids[i] for i in order]
+            keys = [keys[i] for i in order]
+            places = [places[i] for i in order]
+            amounts = [amounts[i] for i in order]
+
+        schedule = cls()
+        schedule.ids = ids
+        schedule.keys = array("q", keys)
+        schedule.places = array("i", places)
+        schedule.amounts = amounts
+        return schedule
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __iter__(self) -> Iterator[Exam]:
+        for i in range(len(self.ids)):
+            yield self.exam(i)
+
+    def index(self) -> dict[str, int]:
+        """Row number of every slot id, built on first use."""
+        if self._index is None:
+            self._index = {slot_id: i for i, slot_id in enumerate(self.ids)}
+        return self._index
+
+    def exam(self, index: int) -> Exam:
+        dt = to_datetime(self.keys[index])
+        return Exam(
+            id=self.ids[index],
+            places=self.places[index],
+            dateStr=dt.isoformat(),
+            date=dt,
+            amount=self.amounts[index],
+        )
+
+    def earliest(self) -> Optional[Exam]:
+        return self.exam(0) if self.ids else None
+
+    def earliest_matching(self, match) -> Optional[Exam]:
+        """Return the earliest exam accepted by ``match``.
+
+        ``match`` is either a ``SlotFilter`` (anything with ``first_index``), which is
+        matched by bisecting the sorted keys, or a predicate called with each date key.
+        """
+        first_index = getattr(match, "first_index", None)
+        if first_index is not None:
+            i = first_index(self.keys)
+            return self.exam(i) if i is not None else None
+
+        for i, key in enumerate(self.keys):
+            if match(key):
+                return self.exam(i)
+        return None
+
+
+class ScheduleSet:
+    """The schedules of every exam type in one exam-schedule response.
+
+    The payload lists theory and practice exams side by side, so one fetch and one walk
+    over it serve consumers of any type; each ``Schedule`` keeps its own lazy index.
+    ``span`` is the first and last day the request asked for, or None if every day is in.
+    """
+
+    __slots__ = ("_schedules", "span")
+
+    def __init__(
+        self,
+        schedules: Optional[dict[str, Schedule]] = None,
+        span: Optional[tuple[date, date]] = None,
+    ) -> None:
+        self._schedules = schedules or {}
+        self.span = span
+
+    @classmethod
+    def from_response(
+        cls,
+        data: dict,
+        exam_types: tuple[str, ...] = EXAM_TYPES,
+        span: Optional[tuple[date, date]] = None,
+    ) -> "ScheduleSet":
+        columns = {exam_type: ([], [], [], []) for exam_type in exam_types}
+        parsed: dict[str, int] = {}
+
+        for scheduled_day in data['schedule']['scheduledDays']:
+            for scheduled_hour in scheduled_day['scheduledHours']:
+                for exam_type, (ids, keys, places, amounts) in columns.items():
+                    for exam in scheduled_hour.get(exam_type, ()):
+                        date_str = exam['date']
+                        key = parsed.get(date_str)
+                        if key is None:
+                            key = parsed[date_str] = parse_timestamp(date_str)
+                        ids.append(exam['id'])
+                        keys.append(key)
+                        places.append(exam['places'])
+                        amounts.append(exam['amount'])
+
+        return cls({exam_type: Schedule.from_columns(*cols) for exam_type, cols in columns.items()}, span)
+
+    @property
+    def exam_types(self) -> tuple[str, ...]:
+        return tuple(self._schedules)
+
+    def of(self, exam_type: str) -> Schedule:
+        """Schedule of ``exam_type``; empty if the response did not include it."""
+        schedule = self._schedules.get(exam_type)
+        if schedule is None:
+            schedule = self._schedules[exam_type] = Schedule()
+        return schedule
+
+    def __len__(self) -> int:
+        return sum(len(schedule) for schedule in self._schedules.values())
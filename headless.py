@@ -0,0 +1,257 @@
+"""Headless runner: polls and reschedules like the TUI, but prints JSON lines instead.
+
+Uses the settings saved in ``config.json`` by the TUI and never imports Textual/Rich,
+which keeps start-up time and memory low on small always-on machines::
+
+    python headless.py
+    python headless.py --dry-run --output sniper.jsonl
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import signal
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, TextIO
+
+from app_state import Stats
+from cassette import CassetteRecorder
+from config_manager import CONFIG_WATCH_INTERVAL, ConfigWatcher, load_config, validate_config
+from history_store import HISTORY_PATH, HistoryStore
+from infocar import InfoCarSession, load_proxies
+from metrics import METRICS_EXPORT_INTERVAL, export_metrics
+from notifications import Notification, Notifier
+from poll_engine import PollEngine
+from profiler import Profiler
+from slot_events import ScheduleDiffer, SlotAppeared, SlotDisappeared
+from slot_filter import SlotFilter
+from token_cache import TOKEN_CACHE_PATH
+
+
+class JsonLinesLog:
+    def __init__(self, out: TextIO) -> None:
+        self.out = out
+
+    def emit(self, event: str, **fields) -> None:
+        record = {"ts": datetime.now().isoformat(timespec="seconds"), "event": event, **fields}
+        self.out.write(json.dumps(record, default=str, ensure_ascii=False) + "\n")
+        self.out.flush()
+
+
+def _fmt(dt: Optional[datetime]) -> Optional[str]:
+    return dt.isoformat() if dt is not None else None
+
+
+async def export_metrics_periodically(session: InfoCarSession, path: Path) -> None:
+    while True:
+        await asyncio.sleep(METRICS_EXPORT_INTERVAL)
+        export_metrics(session.metrics, path)
+
+
+async def run(
+    log: JsonLinesLog,
+    dry_run: bool = False,
+    metrics_path: Optional[Path] = None,
+    cassette: Optional[CassetteRecorder] = None,
+    history: Optional[HistoryStore] = None,
+) -> int:
+    cfg = load_config()
+    if not (cfg.username and cfg.password and cfg.capmonster_key):
+        log.emit("error", message="config.json is missing username, password or capmonster_key; log in once with main.py")
+        return 2
+    try:
+        validate_config(cfg)
+    except ValueError as e:
+        log.emit("error", message=f"Invalid search preferences in config.json: {e}")
+        return 2
+    slot_filter = SlotFilter.from_config(cfg)
+
+    # Stop cleanly under service managers too, not just on Ctrl+C
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    except (NotImplementedError, RuntimeError):
+        pass
+
+    session = InfoCarSession(
+        cfg.capmonster_key,
+        proxies=load_proxies(),
+        token_cache_path=TOKEN_CACHE_PATH,
+        cassette=cassette,
+    )
+    stats = history.load_stats() if history is not None else Stats()
+    notifier = Notifier.from_config(cfg)
+    differ = ScheduleDiffer()
+    engine: Optional[PollEngine] = None
+    exporter = None
+    if metrics_path is not None:
+        exporter = asyncio.create_task(export_metrics_periodically(session, metrics_path))
+    watcher = ConfigWatcher()
+    reloader = None
+
+    async def reload_config_periodically() -> None:
+        # Search preferences edited in config.json apply to the running engine, no re-login
+        nonlocal cfg, slot_filter, notifier
+        while True:
+            await asyncio.sleep(CONFIG_WATCH_INTERVAL)
+            try:
+                new_cfg = watcher.poll()
+            except ValueError as e:
+                log.emit("config_error", message=str(e))
+                continue
+            if new_cfg is None:
+                continue
+            cfg = new_cfg
+            slot_filter = SlotFilter.from_config(cfg)
+            notifier.close(timeout=0)
+            notifier = Notifier.from_config(cfg)
+            log.emit(
+                "config_reloaded",
+                date_from=cfg.date_from,
+                date_to=cfg.date_to,
+                hour_from=cfg.hour_from,
+                hour_to=cfg.hour_to,
+            )
+            if engine is not None:
+                engine.set_filter(slot_filter)
+
+    try:
+        if await session.get_capmonster_balance() <= 0:
+            log.emit("error", message="CapMonster balance is 0. Please top up.")
+            return 2
+
+        reservations = await session.login_or_resume(cfg.username, cfg.password)
+        reservation = reservations[0]
+        word_id = reservation['exam']['organizationUnitId']
+        if not await session.is_reschedule_enabled_for_word(word_id):
+            log.emit("error", message="Rescheduling is not enabled for your driving test center.")
+            return 2
+
+        log.emit(
+            "started",
+            reservation_date=reservation['exam']['practice']['date'],
+            word=reservation['exam'].get('organizationUnitName'),
+            date_from=cfg.date_from,
+            date_to=cfg.date_to,
+            hour_from=cfg.hour_from,
+            hour_to=cfg.hour_to,
+        )
+        reloader = asyncio.create_task(reload_config_periodically())
+
+        while True:
+            outcome: asyncio.Future = asyncio.get_running_loop().create_future()
+
+            def on_update(events) -> None:
+                log.emit(
+                    "poll",
+                    checks=stats.all_checks,
+                    changed=bool(events),
+                    appeared=sum(isinstance(e, SlotAppeared) for e in events),
+                    disappeared=sum(isinstance(e, SlotDisappeared) for e in events),
+                    open_slots=stats.open_slots,
+                    current_earliest=_fmt(stats.current_earliest_time),
+                    earliest_ever=_fmt(stats.earliest_ever_time),
+                    turnstile_solves=session.turnstile_solve_count,
+                )
+
+            def on_error(error: Exception) -> None:
+                log.emit("poll_error", error=type(error).__name__, message=str(error))
+
+            engine = PollEngine(
+                session=session,
+                reservation=reservation,
+                slot_filter=slot_filter,
+                stats=stats,
+                differ=differ,
+                on_update=on_update,
+                on_error=on_error,
+                on_match=lambda exam: outcome.set_result(exam),
+                on_auth_error=lambda error: outcome.set_result(None),
+                history=history,
+            )
+            engine.start()
+            exam = await outcome
+
+            if exam is None:
+                log.emit("reauthenticating")
+                await session.login(cfg.username, cfg.password)
+                continue
+
+            log.emit("match", exam_id=exam.id, date=exam.dateStr, places=exam.places)
+            notifier.notify(Notification(
+                "Exam slot found",
+                exam.date.strftime("%Y-%m-%d %H:%M"),
+                kind="match",
+                data={"exam_id": exam.id, "date": exam.dateStr},
+            ))
+            if dry_run:
+                return 0
+            old_date = reservation['exam']['practice']['date']
+            try:
+                await session.reschedule_exam(reservation['id'], exam.id)
+            except Exception as e:
+                notifier.notify(Notification("Failed to reschedule an exam", str(e), kind="reschedule_failed"))
+                raise
+            log.emit("rescheduled", exam_id=exam.id, date=exam.dateStr, old_date=old_date)
+            notifier.notify(Notification(
+                "Exam rescheduled",
+                f"New date: {exam.date.strftime('%Y-%m-%d %H:%M')}",
+                kind="rescheduled",
+                data={"exam_id": exam.id, "date": exam.dateStr, "old_date": old_date},
+            ))
+            return 0
+    finally:
+        if reloader is not None:
+            reloader.cancel()
+        if engine is not None:
+            engine.stop()
+            await engine.join()
+        notifier.close()
+        if exporter is not None:
+            exporter.cancel()
+            export_metrics(session.metrics, metrics_path)
+        await session.aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the Info-Car sniper without the terminal UI.")
+    parser.add_argument("--dry-run", action="store_true", help="Report a matching slot but do not reschedule")
+    parser.add_argument("--output", type=Path, help="Append JSON lines to this file instead of stdout")
+    parser.add_argument("--metrics", type=Path, help="Export request metrics to this file (.jsonl, otherwise Prometheus text)")
+    parser.add_argument("--profile", type=Path, metavar="DIR", help="Write CPU samples and memory snapshots to DIR")
+    parser.add_argument("--record", type=Path, metavar="CASSETTE", help="Record redacted Info-Car traffic to CASSETTE (.jsonl or .jsonl.gz)")
+    parser.add_argument("--history", type=Path, default=HISTORY_PATH, help=f"Slot history database (default: {HISTORY_PATH})")
+    parser.add_argument("--no-history", action="store_true", help="Do not keep slot history")
+    args = parser.parse_args()
+
+    out = args.output.open("a", encoding="utf-8") if args.output else sys.stdout
+    log = JsonLinesLog(out)
+    profiler = Profiler(args.profile) if args.profile is not None else None
+    cassette = CassetteRecorder(args.record) if args.record is not None else None
+    history = None if args.no_history else HistoryStore(args.history)
+    if profiler is not None:
+        profiler.start()
+    try:
+        code = asyncio.run(run(log, dry_run=args.dry_run, metrics_path=args.metrics, cassette=cassette, history=history))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        log.emit("stopped")
+        code = 130
+    except Exception as e:
+        log.emit("error", error=type(e).__name__, message=str(e))
+        code = 1
+    finally:
+        if profiler is not None:
+            profiler.stop()
+        if cassette is not None:
+            cassette.close()
+        if history is not None:
+            history.close()
+        if out is not sys.stdout:
+            out.close()
+    sys.exit(code)
+
+
+if __name__ == "__main__":
+    main()
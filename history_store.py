@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import math
+import sqlite3
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from itertools import groupby
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+from exam_schedule import Schedule, to_datetime, to_key
+from slot_events import PlacesChanged, SlotAppeared, SlotDisappeared, SlotEvent
+
+if TYPE_CHECKING:
+    from app_state import Stats
+
+HISTORY_PATH = Path("history.sqlite3")
+
+# Pending changes are written at most this often (or once this many pile up)
+FLUSH_INTERVAL = 30.0
+MAX_PENDING = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS slot_intervals (
+    slot_id   TEXT    NOT NULL,
+    key       INTEGER NOT NULL,  -- exam date, see exam_schedule.to_key
+    places    INTEGER NOT NULL,
+    amount    INTEGER NOT NULL,
+    opened_at REAL    NOT NULL,  -- unix time the slot was first seen
+    closed_at REAL               -- unix time it was gone, NULL while open
+);
+CREATE INDEX IF NOT EXISTS slot_intervals_slot ON slot_intervals (slot_id, opened_at);
+CREATE INDEX IF NOT EXISTS slot_intervals_opened ON slot_intervals (opened_at, key);
+CREATE INDEX IF NOT EXISTS slot_intervals_open ON slot_intervals (slot_id) WHERE closed_at IS NULL;
+
+CREATE TABLE IF NOT EXISTS meta (
+    name  TEXT PRIMARY KEY,
+    value
+);
+"""
+
+_INSERT = "INSERT INTO slot_intervals (slot_id, key, places, amount, opened_at) VALUES (?, ?, ?, ?, ?)"
+_CLOSE = "UPDATE slot_intervals SET closed_at = ? WHERE slot_id = ? AND closed_at IS NULL"
+_PLACES = "UPDATE slot_intervals SET places = ? WHERE slot_id = ? AND closed_at IS NULL"
+_META = "INSERT INTO meta (name, value) VALUES (?, ?) ON CONFLICT (name) DO UPDATE SET value = excluded.value"
+
+
+@dataclass(frozen=True)
+class SlotInterval:
+    slot_id: str
+    key: int
+    places: int
+    opened_at: float
+    closed_at: Optional[float]
+
+    @property
+    def date(self) -> datetime:
+        return to_datetime(self.key)
+
+    @property
+    def duration(self) -> float:
+        """Seconds the slot stayed open (so far, if it still is)."""
+        return (self.closed_at if self.closed_at is not None else time.time()) - self.opened_at
+
+
+class HistoryStore:
+    """Every slot ever seen, as open/close intervals in a local SQLite file.
+
+    Only the slot events of each poll are written, never whole schedules, and they are
+    batched into one transaction every ``flush_interval`` seconds. ``load_stats()`` brings
+    the counters of ``Stats`` back after a restart.
+    """
+
+    def __init__(self, path: Path = HISTORY_PATH, flush_interval: float = FLUSH_INTERVAL) -> None:
+        self.path = Path(path)
+        self.flush_interval = flush_interval
+
+        self.db = sqlite3.connect(self.path)
+        self.db.execute("PRAGMA journal_mode = WAL")
+        self.db.execute("PRAGMA synchronous = NORMAL")
+        self.db.executescript(_SCHEMA)
+
+        # Slots open according to the database, so a restart does not reopen them
+        # slot_id -> (key, places)
+        self._open: dict[str, tuple[int, int]] = {
+            slot_id: (key, places)
+            for slot_id, key, places in self.db.execute(
+                "SELECT slot_id, key, places FROM slot_intervals WHERE closed_at IS NULL"
+            )
+        }
+        # Span last checked against the open slots; False until the first poll
+        self._reconciled: object = False
+        self._pending: list[tuple[str, tuple]] = []
+        self._stats: Optional["Stats"] = None
+        self._last_flush = time.monotonic()
+
+    def record(
+        self,
+        schedule: Schedule,
+        events: list[SlotEvent],
+        stats: "Stats",
+        span: Optional[tuple[date, date]] = None,
+    ) -> None:
+        """Queue the changes of one poll of the days in ``span`` (every day if None).
+
+        Writes them out when the batch is due.
+        """
+        now = time.time()
+        pending = self._pending
+
+        if span != self._reconciled:
+            # The first poll after a start diffs against nothing, and a new span fetches days
+            # the differ may not know: slots of those days that closed while nobody was looking
+            # are simply missing from it. Days outside the span tell nothing.
+            self._reconciled = span
+            if span is None:
+                lo, hi = -math.inf, math.inf
+            else:
+                lo = to_key(datetime.combine(span[0], datetime.min.time()))
+                hi = to_key(datetime.combine(span[1] + timedelta(days=1), datetime.min.time()))
+            past = to_key(datetime.now())
+            current = schedule.index()
+            for slot_id in [
+                slot_id for slot_id, (key, _) in self._open.items()
+                if slot_id not in current and (lo <= key < hi or key < past)
+            ]:
+                del self._open[slot_id]
+                pending.append((_CLOSE, (now, slot_id)))
+
+        for event in events:
+            if isinstance(event, SlotAppeared):
+                known = self._open.get(event.id)
+                if known is None:
+                    pending.append((_INSERT, (event.id, event.key, event.places, event.amount, now)))
+                elif known[1] != event.places:
+                    pending.append((_PLACES, (event.places, event.id)))
+                self._open[event.id] = (event.key, event.places)
+            elif isinstance(event, SlotDisappeared):
+                if self._open.pop(event.id, None) is not None:
+                    pending.append((_CLOSE, (now, event.id)))
+            elif isinstance(event, PlacesChanged):
+                self._open[event.id] = (event.key, event.after)
+                pending.append((_PLACES, (event.after, event.id)))
+
+        self._stats = stats
+        if len(pending) >= MAX_PENDING or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        pending, self._pending = self._pending, []
+        stats = self._stats
+        self._last_flush = time.monotonic()
+        if not pending and stats is None:
+            return
+
+        with self.db:
+            # Keep the order of events, but hand consecutive statements of one kind over at once
+            for sql, group in groupby(pending, key=lambda op: op[0]):
+                self.db.executemany(sql, [params for _, params in group])
+            if stats is not None:
+                self.db.executemany(_META, [
+                    ("all_checks", stats.all_checks),
+                    ("earliest_ever", _key_or_none(stats.earliest_ever_time)),
+                    ("last_found", _key_or_none(stats.last_found_time)),
+                ])
+
+    def close(self) -> None:
+        self.flush()
+        self.db.close()
+
+    def load_stats(self) -> "Stats":
+        """Stats with the counters of previous runs; open slots are refilled by the first poll."""
+        from app_state import Stats
+
+        meta = dict(self.db.execute("SELECT name, value FROM meta"))
+        return Stats(
+            all_checks=int(meta.get("all_checks") or 0),
+            earliest_ever_time=_datetime_or_none(meta.get("earliest_ever")),
+            last_found_time=_datetime_or_none(meta.get("last_found")),
+        )
+
+    def slot_history(self, slot_id: str) -> list[SlotInterval]:
+        """Every time ``slot_id`` was open, oldest first."""
+        rows = self.db.execute(
+            "SELECT slot_id, key, places, opened_at, closed_at FROM slot_intervals"
+            " WHERE slot_id = ? ORDER BY opened_at",
+            (slot_id,),
+        )
+        return [SlotInterval(*row) for row in rows]
+
+    def open_durations(self, since: Optional[float] = None) -> list[float]:
+        """How many seconds each slot that has since closed stayed open, oldest first."""
+        rows = self.db.execute(
+            "SELECT closed_at - opened_at FROM slot_intervals"
+            " WHERE opened_at >= ? AND closed_at IS NOT NULL ORDER BY opened_at",
+            (since or 0,),
+        )
+        return [row[0] for row in rows]
+
+    def earliest_per_day(self, first_day: Optional[date] = None, last_day: Optional[date] = None) -> list[tuple[date, datetime]]:
+        """Earliest exam date that was open at some point of each day."""
+        if first_day is None:
+            row = self.db.execute("SELECT MIN(opened_at) FROM slot_intervals").fetchone()
+            if row[0] is None:
+                return []
+            first_day = datetime.fromtimestamp(row[0]).date()
+        last_day = last_day or date.today()
+
+        result = []
+        day = first_day
+        while day <= last_day:
+            start = datetime.combine(day, datetime.min.time()).timestamp()
+            end = datetime.combine(day + timedelta(days=1), datetime.min.time()).timestamp()
+            row = self.db.execute(
+                "SELECT MIN(key) FROM slot_intervals WHERE opened_at < ? AND (closed_at IS NULL OR closed_at >= ?)",
+                (end, start),
+            ).fetchone()
+            if row[0] is not None:
+                result.append((day, to_datetime(row[0])))
+            day += timedelta(days=1)
+        return result
+
+
+def _key_or_none(dt: Optional[datetime]) -> Optional[int]:
+    return to_key(dt) if dt is not None else None
+
+
+def _datetime_or_none(key) -> Optional[datetime]:
+    return to_datetime(int(key)) if key is not None else None
@@ -1,97 +1,244 @@
 from dataclasses import dataclass
+import hashlib
 import random
-from urllib3.util.ssl_ import create_urllib3_context
-from capmonster_python import CapmonsterClient, TurnstileTask
-import requests
+import ssl
+import httpx
 import json
-from requests.adapters import HTTPAdapter
-import urllib3
 import time
 import re
+from email.utils import parsedate_to_datetime
+from pathlib import Path
 from urllib.parse import urlparse, parse_qs
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+from exam_schedule import Exam, Schedule, ScheduleSet, THEORY_EXAM_TYPE, PRACTICE_EXAM_TYPE
+from metrics import Metrics
+from token_cache import clear_token, load_token, save_token
 
-class SSLAdapter(HTTPAdapter):
-    def __init__(self, ssl_context=None, **kwargs):
-        self.ssl_context = ssl_context
-        super().__init__(**kwargs)
+def legacy_ssl_context() -> ssl.SSLContext:
+    ctx = ssl.create_default_context()
+    # Lower OpenSSL security level to allow smaller DH keys used by legacy servers
+    try:
+        ctx.set_ciphers('DEFAULT@SECLEVEL=1')
+    except Exception:
+        # Fallback for environments that don't support @SECLEVEL
+        ctx.set_ciphers('DEFAULT')
 
-    def init_poolmanager(self, *args, **kwargs):
-        kwargs['ssl_context'] = self.ssl_context
-        return super().init_poolmanager(*args, **kwargs)
+    # Improve compatibility with legacy TLS servers when available
+    ctx.options |= getattr(ssl, 'OP_LEGACY_SERVER_CONNECT', 0)
 
-    def proxy_manager_for(self, proxy, **proxy_kwargs):
-        # Ensure the same ssl_context is used when connecting to HTTPS proxies
-        proxy_kwargs['ssl_context'] = self.ssl_context
-        return super().proxy_manager_for(proxy, **proxy_kwargs)
+    ctx.check_hostname = False
+    ctx.verify_mode = ssl.CERT_NONE
+    return ctx
 
+PROXIES_PATH = Path("proxies.txt")
+# Proxy URL schemes httpx connects through without extras (SOCKS needs socksio)
+PROXY_SCHEMES = {"http", "https"}
 
-THEORY_EXAM_TYPE = 'theoryExams'
-PRACTICE_EXAM_TYPE = 'practiceExams'
+def load_proxies(path: Path = PROXIES_PATH) -> list[str]:
+    """Proxy URLs from ``path``, one per line; blank lines and lines that are not proxy URLs are skipped."""
+    try:
+        lines = path.read_text().splitlines()
+    except OSError:
+        return []
+    proxies = []
+    for line in lines:
+        url = urlparse(line.strip())
+        if url.scheme in PROXY_SCHEMES and url.hostname:
+            proxies.append(line.strip())
+    return proxies
+
+class RotatingProxyTransport(httpx.AsyncBaseTransport):
+    """Sends requests through one of several proxies; ``rotate`` picks another at random.
+
+    The session rotates once per public call, so the requests of one flow (e.g. the
+    three login requests sharing cookies) all leave from the same IP.
+    """
+
+    def __init__(self, proxies, ssl_context):
+        self.transports = [httpx.AsyncHTTPTransport(proxy=proxy, verify=ssl_context) for proxy in proxies]
+        self.rotate()
+
+    def rotate(self):
+        self.current = random.choice(self.transports)
+
+    async def handle_async_request(self, request):
+        return await self.current.handle_async_request(request)
+
+    async def aclose(self):
+        for transport in self.transports:
+            await transport.aclose()
+
+
+BASE_URL = "https://info-car.pl"
 
 MAX_TURNSTILE_USES = 30
 MAX_TURNSTILE_LIFETIME = 300
 
-@dataclass
-class Exam:
-    id: str
-    places: int
-    dateStr: str
-    date: datetime
-    amount: int
+# How far ahead the exam-schedule endpoint accepts an endDate
+MAX_SCHEDULE_DAYS = 60
 
 class AuthenticationError(Exception):
     pass
 
-class InfoCarSession:
-    def __init__(self, capmonster_key, proxies=[]):
-        self.session = requests.session()
+class RequestError(Exception):
+    """Non-success answer from Info-Car, with what the server said about retrying."""
 
-        ctx = create_urllib3_context()
-        # Lower OpenSSL security level to allow smaller DH keys used by legacy servers
-        try:
-            ctx.set_ciphers('DEFAULT@SECLEVEL=1')
-        except Exception:
-            # Fallback for environments that don't support @SECLEVEL
-            ctx.set_ciphers('DEFAULT')
+    def __init__(self, message, status_code=None, retry_after=None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+class RequestRejectedError(RequestError):
+    pass
 
-        # Improve compatibility with legacy TLS servers when available
-        _ssl = __import__('ssl')
-        ctx.options |= getattr(_ssl, 'OP_LEGACY_SERVER_CONNECT', 0)
+def parse_retry_after(value) -> float | None:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
 
-        ctx.check_hostname = False
-        ctx.verify_mode = _ssl.CERT_NONE
+@dataclass
+class _CachedSchedule:
+    start: date
+    end: date
+    etag: str
+    digest: bytes
+    schedules: ScheduleSet
 
-        adapter = SSLAdapter(ssl_context=ctx)
-        self.session.mount('https://', adapter)
-        self.session.mount('http://', adapter)
+class InfoCarSession:
+    """Async Info-Car client; every call is meant to run on the app's event loop."""
 
-        self.session.verify = False
+    def __init__(self, capmonster_key, proxies=[], base_url=BASE_URL, timeout=30.0, token_cache_path=None, cassette=None):
+        self.base_url = base_url.rstrip("/")
+        # Where to persist the access token between runs; None disables the cache
+        self.token_cache_path = token_cache_path
+        # CassetteRecorder to also write traffic to disk, or CassettePlayer to replay it offline
+        self.cassette = cassette
+        self.timeout = httpx.Timeout(timeout, connect=10.0)
+        self.ssl_context = legacy_ssl_context()
 
         self.access_token = ""
         self.turnstile_token = ""
         self.turnstile_uses = 0
         self.turnstile_date = None
-        self.capmonster = CapmonsterClient(api_key=capmonster_key)
         self.turnstile_solve_count = 0
+        # Last schedule per (word_id, category), so unchanged responses return the very same
+        # object; one entry each, so a range that moves every day does not pile up old ones
+        self._schedule_cache: dict[tuple, _CachedSchedule] = {}
+        self.metrics = Metrics()
 
+        self.capmonster_key = capmonster_key
+        self._capmonster = None
         self.proxies = proxies
+        self.client = self._build_client()
+
+    @property
+    def capmonster(self):
+        # capmonster_python pulls in pydantic, which is slow to import, and a resumed
+        # session may never need a Turnstile solve
+        if self._capmonster is None:
+            from capmonster_python import CapmonsterClient
 
-    def login(self, username, password):
+            self._capmonster = CapmonsterClient(api_key=self.capmonster_key)
+        return self._capmonster
+
+    def _build_client(self, cookies=None):
+        mounts = {}
+        self._proxy_transport = None
         if len(self.proxies) > 0:
-            self.session.proxies.update({
-                'https': random.choice(self.proxies)
-            })
+            # Like before, only HTTPS traffic goes through the proxies
+            self._proxy_transport = RotatingProxyTransport(self.proxies, self.ssl_context)
+            mounts["https://"] = self._proxy_transport
+
+        transport = None
+        if self.cassette is not None:
+            transport = self.cassette.transport(httpx.AsyncHTTPTransport(verify=self.ssl_context))
+            mounts = {pattern: self.cassette.transport(inner) for pattern, inner in mounts.items()}
+
+        return httpx.AsyncClient(
+            verify=self.ssl_context,
+            mounts=mounts,
+            transport=transport,
+            cookies=cookies,
+            timeout=self.timeout,
+        )
+
+    async def get_capmonster_balance(self) -> float:
+        return await self.capmonster.get_balance_async()
+
+    async def reconfigure(self, capmonster_key, proxies):
+        """Switch to a new CapMonster key and proxy list, keeping cookies and tokens."""
+        if capmonster_key != self.capmonster_key:
+            await self._close_capmonster()
+            self.capmonster_key = capmonster_key
+        self.proxies = proxies
 
-        resp = self.session.get(
-            "https://info-car.pl/oauth2/login",
-            allow_redirects=True,
+        old_client = self.client
+        self.client = self._build_client(old_client.cookies)
+        await old_client.aclose()
+
+    async def aclose(self):
+        await self.client.aclose()
+        await self._close_capmonster()
+
+    async def _close_capmonster(self):
+        # CapmonsterClient has no close method of its own, so its httpx clients are shut here
+        client, self._capmonster = self._capmonster, None
+        if client is None:
+            return
+        async_client = getattr(client, "_CapmonsterClient__async_client", None)
+        if async_client is not None:
+            await async_client.aclose()
+        sync_client = getattr(client, "_CapmonsterClient__sync_client", None)
+        if sync_client is not None:
+            sync_client.close()
+
+    def _rotate_proxy(self):
+        """Pick the proxy for the next call; like before, a call's requests share one."""
+        if self._proxy_transport is not None:
+            self._proxy_transport.rotate()
+
+    async def _request(self, endpoint, method, url, **kwargs) -> httpx.Response:
+        """Send one request through the shared client, recording it under ``endpoint`` in ``self.metrics``."""
+        t0 = time.perf_counter()
+        try:
+            resp = await self.client.request(method, url, **kwargs)
+        except Exception:
+            self.metrics.observe_request(endpoint, "error", time.perf_counter() - t0)
+            raise
+        self.metrics.observe_request(
+            endpoint,
+            resp.status_code,
+            time.perf_counter() - t0,
+            sent=len(resp.request.content),
+            received=resp.num_bytes_downloaded,
+        )
+        return resp
+
+    async def login(self, username, password):
+        self._rotate_proxy()
+        resp = await self._request(
+            "login_page",
+            "GET",
+            f"{self.base_url}/oauth2/login",
+            follow_redirects=True,
         )
 
         if resp.status_code != 200:
-            raise Exception(f"Request failed with status code {resp.status_code}: {resp.text}")
+            raise RequestError(
+                f"Request failed with status code {resp.status_code}: {resp.text}",
+                resp.status_code,
+                parse_retry_after(resp.headers.get("Retry-After")),
+            )
 
         # Extract CSRF token robustly (supports single/double quotes)
         m = re.search(r'name=[\"\']_csrf[\"\']\s+value=[\"\']([^\"\']+)[\"\']', resp.text)
@@ -99,8 +246,10 @@ class InfoCarSession:
             raise Exception("Could not find CSRF token on login page")
         csrf = m.group(1)
 
-        resp = self.session.post(
-            "https://info-car.pl/oauth2/login",
+        resp = await self._request(
+            "login_submit",
+            "POST",
+            f"{self.base_url}/oauth2/login",
             data={
                 "username": username,
                 "_csrf": [
@@ -109,7 +258,7 @@ class InfoCarSession:
                 ],
                 "password": password,
             },
-            allow_redirects=False
+            follow_redirects=False
         )
 
         if resp.status_code != 302 and resp.status_code != 200:
@@ -120,9 +269,11 @@ class InfoCarSession:
         if "?error=failure" in loc:
             raise Exception("Invalid credentials to Infocar")
 
-        resp = self.session.get(
-            "https://info-car.pl/oauth2/authorize?response_type=id_token%20token&client_id=client&state=am9zY0lXV1ZyY3VrdzlCazRxcVdGTjlIRzQ1NlFxTTdUaFJmbi5LQzZUaU5X&redirect_uri=https%3A%2F%2Finfo-car.pl%2Fnew%2Fassets%2Frefresh.html&scope=openid%20profile%20email%20resource.read&nonce=am9zY0lXV1ZyY3VrdzlCazRxcVdGTjlIRzQ1NlFxTTdUaFJmbi5LQzZUaU5X&prompt=none",
-            allow_redirects=False
+        resp = await self._request(
+            "authorize",
+            "GET",
+            f"{self.base_url}/oauth2/authorize?response_type=id_token%20token&client_id=client&state=am9zY0lXV1ZyY3VrdzlCazRxcVdGTjlIRzQ1NlFxTTdUaFJmbi5LQzZUaU5X&redirect_uri=https%3A%2F%2Finfo-car.pl%2Fnew%2Fassets%2Frefresh.html&scope=openid%20profile%20email%20resource.read&nonce=am9zY0lXV1ZyY3VrdzlCazRxcVdGTjlIRzQ1NlFxTTdUaFJmbi5LQzZUaU5X&prompt=none",
+            follow_redirects=False
         )
 
         if resp.status_code != 302:
@@ -143,43 +294,87 @@ class InfoCarSession:
             raise Exception("Access token not found in authorization redirect")
         self.access_token = token_list[0]
 
-    def solve_turnstile(self):
+        if self.token_cache_path is not None:
+            save_token(username, self.access_token, self.token_cache_path)
+
+    def restore_access_token(self, username) -> bool:
+        """Reuse a cached, unexpired access token for ``username`` instead of logging in."""
+        if self.token_cache_path is None:
+            return False
+        token = load_token(username, self.token_cache_path)
+        if token is None:
+            return False
+        self.access_token = token
+        return True
+
+    async def login_or_resume(self, username, password):
+        """Log in, skipping the three login requests when a cached token is still accepted.
+
+        Returns the account reservations, whose request doubles as the token check.
+        """
+        if self.restore_access_token(username):
+            try:
+                return await self.get_account_reservations()
+            except AuthenticationError:
+                pass
+
+        await self.login(username, password)
+        return await self.get_account_reservations()
+
+    def _token_rejected(self):
+        self.access_token = ""
+        if self.token_cache_path is not None:
+            clear_token(self.token_cache_path)
+        raise AuthenticationError("Access token expired or invalid")
+
+    async def solve_turnstile(self):
+        if self.cassette is not None and self.cassette.replaying:
+            # Recorded responses do not check the token, so do not pay for a solve
+            return "replayed"
+
+        from capmonster_python import TurnstileTask
+
         task = TurnstileTask(
             websiteURL="https://info-car.pl/new/konto",
             websiteKey="0x4AAAAAABm6HHqkjoB_Yn_a",
         )
 
-        task_id = self.capmonster.create_task(task)
-        result = self.capmonster.join_task_result(task_id)
+        # Solving blocks the poll that needed it, so it is timed like any other request
+        t0 = time.perf_counter()
+        try:
+            task_id = await self.capmonster.create_task_async(task)
+            result = await self.capmonster.join_task_result_async(task_id)
+        except Exception:
+            self.metrics.observe_request("turnstile", "error", time.perf_counter() - t0)
+            raise
+        self.metrics.observe_request("turnstile", "ok", time.perf_counter() - t0)
 
         self.turnstile_solve_count += 1
         return result["token"]
 
-    def ensure_alive_turnstile(self):
+    async def ensure_alive_turnstile(self):
         if (
             self.turnstile_token == "" or
             self.turnstile_uses >= MAX_TURNSTILE_USES or
             self.turnstile_date is None or
             (time.time() - self.turnstile_date) >= MAX_TURNSTILE_LIFETIME
         ):
-            self.turnstile_token = self.solve_turnstile()
+            self.turnstile_token = await self.solve_turnstile()
             self.turnstile_uses = 0
             self.turnstile_date = time.time()
 
-    def _to_iso(self, d: datetime) -> str:
+    def _to_iso(self, d: date) -> str:
         return d.strftime("%Y-%m-%dT%H:%M:%S.000Z")
     
-    def is_reschedule_enabled_for_word(self, word_id: str) -> bool:
+    async def is_reschedule_enabled_for_word(self, word_id: str) -> bool:
         if self.access_token == "":
             raise Exception("User is not authenticated")
         
-        if len(self.proxies) > 0:
-            self.session.proxies.update({
-                'https': random.choice(self.proxies)
-            })
-
-        resp = self.session.get(
-            f"https://info-car.pl/api/word/word-centers/reschedule-enabled/{word_id}",
+        self._rotate_proxy()
+        resp = await self._request(
+            "reschedule_enabled",
+            "GET",
+            f"{self.base_url}/api/word/word-centers/reschedule-enabled/{word_id}",
             headers={
                 "Authorization": f"Bearer {self.access_token}",
                 "Accept-Language": "pl-PL",
@@ -189,88 +384,117 @@ class InfoCarSession:
             },
         )
 
+        if resp.status_code == 401:
+            self._token_rejected()
+
         if resp.status_code != 200:
-            raise Exception(f"Request failed with status code {resp.status_code}: {resp.text}")
+            raise RequestError(
+                f"Request failed with status code {resp.status_code}: {resp.text}",
+                resp.status_code,
+                parse_retry_after(resp.headers.get("Retry-After")),
+            )
 
         data = resp.json()
         return data.get('rescheduleEnabled', False)
 
-    def get_exams(self, exam_type, word_id, category="B") -> list[Exam]:
-        if self.access_token == "":
-            raise Exception("User is not authenticated")
- 
-        if len(self.proxies) > 0:
-            self.session.proxies.update({
-                'https': random.choice(self.proxies)
-            })
+    async def get_exams(self, exam_type, word_id, category="B", start_date=None, end_date=None) -> Schedule:
+        """Fetch the schedule of one exam type, see ``get_schedules``."""
+        schedules = await self.get_schedules(word_id, category, start_date, end_date)
+        return schedules.of(exam_type)
 
-        self.ensure_alive_turnstile()
-        self.turnstile_uses += 1
+    async def get_schedules(self, word_id, category="B", start_date=None, end_date=None) -> ScheduleSet:
+        """Fetch the exam schedule of every exam type, limited to ``start_date``..``end_date`` when given.
+
+        The range is clamped to what the API serves (today .. today + MAX_SCHEDULE_DAYS);
+        if nothing is left after clamping no request is made and empty schedules are returned.
+        ``end_date`` is inclusive: the request ends at the midnight after it, so the last day
+        is served however the endpoint compares ``endDate``.
 
+        When the response is identical to the previous one for the same request (304 or
+        same body), the previously returned ``ScheduleSet`` (and so the same ``Schedule``
+        objects) is returned again without decoding anything, so callers can detect
+        "no change" with ``is``.
+        """
+        if self.access_token == "":
+            raise Exception("User is not authenticated")
 
         today = datetime.utcnow().date()
+        start = max(start_date or today, today)
+        # Last day asked for; its following midnight must still be within the limit
+        end = min(end_date or today + timedelta(days=MAX_SCHEDULE_DAYS), today + timedelta(days=MAX_SCHEDULE_DAYS - 1))
+        if start > end:
+            return ScheduleSet(span=(start, end))
+ 
+        await self.ensure_alive_turnstile()
+        self.turnstile_uses += 1
 
         req_data = json.dumps({
             "category": category,
-            "endDate": self._to_iso(today + timedelta(days=60)),
-            "startDate": self._to_iso(today),
+            "endDate": self._to_iso(end + timedelta(days=1)),
+            "startDate": self._to_iso(start),
             "wordId": word_id
         })
 
-        resp = self.session.put(
-            "https://info-car.pl/api/word/word-centers/exam-schedule",
-            headers={
-                "Authorization": f"Bearer {self.access_token}",
-                "Accept-Language": "pl-PL",
-                "X-CF-Turnstile": self.turnstile_token,
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:142.0) Gecko/20100101 Firefox/142.0",
-                "Content-Type": "application/json",
-                "Origin": "https://info-car.pl",
-                "Content-Length": str(len(req_data))
-            },
-            data=req_data
+        headers = {
+            "Authorization": f"Bearer {self.access_token}",
+            "Accept-Language": "pl-PL",
+            "X-CF-Turnstile": self.turnstile_token,
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:142.0) Gecko/20100101 Firefox/142.0",
+            "Content-Type": "application/json",
+            "Origin": "https://info-car.pl",
+        }
+
+        # Same request as last time: let the server answer 304, or spot an identical body ourselves
+        cache_key = (word_id, category)
+        cached = self._schedule_cache.get(cache_key)
+        if cached is not None and (cached.start, cached.end) != (start, end):
+            cached = None
+        if cached is not None and cached.etag:
+            headers["If-None-Match"] = cached.etag
+
+        self._rotate_proxy()
+        resp = await self._request(
+            "exam_schedule",
+            "PUT",
+            f"{self.base_url}/api/word/word-centers/exam-schedule",
+            headers=headers,
+            content=req_data
         )
 
         if resp.status_code == 401:
-            raise AuthenticationError("Access token expired or invalid")
+            self._token_rejected()
+
+        if resp.status_code == 304 and cached is not None:
+            return cached.schedules
 
         if resp.status_code != 200:
-            raise Exception(f"Request failed with status code {resp.status_code}: {resp.text}")
+            raise RequestError(
+                f"Request failed with status code {resp.status_code}: {resp.text}",
+                resp.status_code,
+                parse_retry_after(resp.headers.get("Retry-After")),
+            )
+
+        digest = hashlib.blake2b(resp.content, digest_size=16).digest()
+        if cached is not None and cached.digest == digest:
+            return cached.schedules
 
         if "Request Rejected" in resp.text:
-            raise Exception("Request was rejected, likely being an ASP backend error")
+            raise RequestRejectedError("Request was rejected, likely being an ASP backend error", resp.status_code)
 
-        data = resp.json()
-        
-        schedule = data['schedule']
-        scheduled_days = schedule['scheduledDays']
-        
-        exams = []
-
-        for scheduled_day in scheduled_days:
-            for scheduled_hour in scheduled_day['scheduledHours']:
-                for exam in scheduled_hour[exam_type]:
-                    exams.append(Exam(
-                        id=exam['id'],
-                        places=exam['places'],
-                        dateStr=exam['date'],
-                        date=datetime.strptime(exam['date'], "%Y-%m-%dT%H:%M:%S"),
-                        amount=exam['amount']
-                    ))
-
-        return exams
+        with self.metrics.parse("exam_schedule"):
+            schedules = ScheduleSet.from_response(resp.json(), span=(start, end))
+        self._schedule_cache[cache_key] = _CachedSchedule(start, end, resp.headers.get("ETag", ""), digest, schedules)
+        return schedules
     
-    def get_account_reservations(self):
+    async def get_account_reservations(self):
         if self.access_token == "":
             raise Exception("User is not authenticated")
 
-        if len(self.proxies) > 0:
-            self.session.proxies.update({
-                'https': random.choice(self.proxies)
-            })
-
-        resp = self.session.get(
-            "https://info-car.pl/api/word/reservations?limit=10&sort=exam.examDate&direction=DESC",
+        self._rotate_proxy()
+        resp = await self._request(
+            "reservations",
+            "GET",
+            f"{self.base_url}/api/word/reservations?limit=10&sort=exam.examDate&direction=DESC",
             headers={
                 "Authorization": f"Bearer {self.access_token}",
                 "Accept-Language": "pl-PL",
@@ -278,36 +502,41 @@ class InfoCarSession:
             },
         )
 
-        if resp.status_code != 200:
-            raise Exception(f"Request failed with status code {resp.status_code}: {resp.text}")
+        if resp.status_code == 401:
+            self._token_rejected()
 
-        data = resp.json()
+        if resp.status_code != 200:
+            raise RequestError(
+                f"Request failed with status code {resp.status_code}: {resp.text}",
+                resp.status_code,
+                parse_retry_after(resp.headers.get("Retry-After")),
+            )
+
+        with self.metrics.parse("reservations"):
+            data = resp.json()
         return data['items']
     
-    def reschedule_exam(self, reservation_id: str, exam_id: str):
+    async def reschedule_exam(self, reservation_id: str, exam_id: str):
         if self.access_token == "":
             raise Exception("User is not authenticated")
         
-        if len(self.proxies) > 0:
-            self.session.proxies.update({
-                'https': random.choice(self.proxies)
-            })
-
         req_data = json.dumps({
             "updatedPracticeId": exam_id,
         })
 
-        resp = self.session.put(
-            f"https://info-car.pl/api/word/reservations/{reservation_id}/reschedule",
+        self._rotate_proxy()
+        resp = await self._request(
+            "reschedule",
+            "PUT",
+            f"{self.base_url}/api/word/reservations/{reservation_id}/reschedule",
             headers={
                 "Authorization": f"Bearer {self.access_token}",
                 "Accept-Language": "pl-PL",
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:142.0) Gecko/20100101 Firefox/142.0",
                 "Content-Type": "application/json",
                 "Origin": "https://info-car.pl",
-                "Content-Length": str(len(req_data)),
             },
-            data=req_data,
+            content=req_data,
         )
 
         if resp.status_code not in (200, 201):
@@ -1,10 +1,19 @@
 from __future__ import annotations
 
+import argparse
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
 from textual.app import App
 from textual.binding import Binding
 from config_manager import load_config
 from screens.login_screen import LoginScreen
 from app_state import AppState
+from history_store import HISTORY_PATH, HistoryStore
+from metrics import METRICS_EXPORT_INTERVAL, export_metrics
+
+if TYPE_CHECKING:
+    from cassette import CassetteRecorder
 
 class InfoCarApp(App):
     TITLE = "Info-Car Looker"
@@ -34,8 +43,25 @@ class InfoCarApp(App):
     }
     """
 
+    def __init__(
+        self,
+        metrics_path: Optional[Path] = None,
+        cassette: Optional[CassetteRecorder] = None,
+        history_path: Optional[Path] = HISTORY_PATH,
+    ) -> None:
+        super().__init__()
+        self.metrics_path = metrics_path
+        self.history_path = history_path
+        # Handed to the InfoCarSession created on login
+        self.cassette = cassette
+
     def on_mount(self) -> None:
         self.state = AppState()
+        if self.history_path is not None:
+            self.state.history = HistoryStore(self.history_path)
+            self.state.stats = self.state.history.load_stats()
+        if self.metrics_path is not None:
+            self.set_interval(METRICS_EXPORT_INTERVAL, self.export_metrics)
         
         cfg = load_config()
         if cfg.username and cfg.password and cfg.capmonster_key:
@@ -43,10 +69,48 @@ class InfoCarApp(App):
         else:
             self.push_screen(LoginScreen())
 
+    def export_metrics(self) -> None:
+        if self.metrics_path is not None and self.state.session is not None:
+            export_metrics(self.state.session.metrics, self.metrics_path)
+
     def action_quit(self) -> None:
+        self.state.stop_polling()
+        self.export_metrics()
+        if self.state.history is not None:
+            self.state.history.close()
+        if self.state.notifier is not None:
+            self.state.notifier.close()
         self.exit()
 
 
 if __name__ == "__main__":
-    InfoCarApp().run(inline=True)
+    parser = argparse.ArgumentParser(description="Info-Car Sniper")
+    parser.add_argument("--metrics", type=Path, help="Export request metrics to this file (.jsonl, otherwise Prometheus text)")
+    parser.add_argument("--profile", type=Path, metavar="DIR", help="Write CPU samples and memory snapshots to DIR")
+    parser.add_argument("--record", type=Path, metavar="CASSETTE", help="Record redacted Info-Car traffic to CASSETTE (.jsonl or .jsonl.gz)")
+    parser.add_argument("--history", type=Path, default=HISTORY_PATH, help=f"Slot history database (default: {HISTORY_PATH})")
+    parser.add_argument("--no-history", action="store_true", help="Do not keep slot history")
+    args = parser.parse_args()
+
+    cassette = None
+    if args.record is not None:
+        from cassette import CassetteRecorder
+
+        cassette = CassetteRecorder(args.record)
+    app = InfoCarApp(
+        metrics_path=args.metrics,
+        cassette=cassette,
+        history_path=None if args.no_history else args.history,
+    )
+    try:
+        if args.profile is not None:
+            from profiler import Profiler
+
+            with Profiler(args.profile):
+                app.run(inline=True)
+        else:
+            app.run(inline=True)
+    finally:
+        if cassette is not None:
+            cassette.close()
 
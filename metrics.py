@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator, Optional
+
+# Upper bounds in seconds, shared by every histogram so they stay comparable
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# How often the UI and headless runners rewrite the --metrics file
+METRICS_EXPORT_INTERVAL = 15.0
+
+
+class Histogram:
+    """Fixed-bucket histogram, cumulative only on export (like Prometheus)."""
+
+    __slots__ = ("bounds", "counts", "count", "sum")
+
+    def __init__(self, bounds: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.bounds = bounds
+        # One extra bucket for everything above the last bound (+Inf)
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile by interpolating inside its bucket."""
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                if i == len(self.bounds):
+                    return self.bounds[-1]
+                lo = self.bounds[i - 1] if i > 0 else 0.0
+                return lo + (self.bounds[i] - lo) * (rank - seen) / n
+            seen += n
+        return self.bounds[-1]
+
+    def mean(self) -> Optional[float]:
+        return self.sum / self.count if self.count else None
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "buckets": dict(zip([*map(str, self.bounds), "+Inf"], self.counts)),
+        }
+
+
+@dataclass
+class EndpointMetrics:
+    latency: Histogram = field(default_factory=Histogram)
+    parse: Histogram = field(default_factory=Histogram)
+    # HTTP status code, "error" when no response came back at all, or "ok" for a
+    # successful call that is not an HTTP request (a Turnstile solve)
+    statuses: dict[str, int] = field(default_factory=dict)
+    bytes_sent: int = 0
+    bytes_received: int = 0
+
+    @property
+    def requests(self) -> int:
+        return self.latency.count
+
+    @property
+    def failures(self) -> int:
+        return sum(n for status, n in self.statuses.items() if status == "error" or status.startswith(("4", "5")))
+
+    def to_dict(self) -> dict:
+        return {
+            "latency": self.latency.to_dict(),
+            "parse": self.parse.to_dict(),
+            "statuses": dict(self.statuses),
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+        }
+
+
+class Metrics:
+    """Per-endpoint request timings, outcomes and sizes of one ``InfoCarSession``.
+
+    Endpoints are short names such as ``exam_schedule`` or ``turnstile``; the session
+    records every request through ``observe_request`` and decoding through ``parse``.
+    """
+
+    def __init__(self) -> None:
+        self.started_at = time.time()
+        self.endpoints: dict[str, EndpointMetrics] = {}
+
+    def endpoint(self, name: str) -> EndpointMetrics:
+        m = self.endpoints.get(name)
+        if m is None:
+            m = self.endpoints[name] = EndpointMetrics()
+        return m
+
+    def observe_request(self, endpoint: str, status, seconds: float, sent: int = 0, received: int = 0) -> None:
+        m = self.endpoint(endpoint)
+        m.latency.observe(seconds)
+        key = str(status)
+        m.statuses[key] = m.statuses.get(key, 0) + 1
+        m.bytes_sent += sent
+        m.bytes_received += received
+
+    @contextmanager
+    def parse(self, endpoint: str) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.endpoint(endpoint).parse.observe(time.perf_counter() - t0)
+
+    def snapshot(self) -> dict:
+        return {
+            "ts": time.time(),
+            "uptime": round(time.time() - self.started_at, 3),
+            "endpoints": {name: m.to_dict() for name, m in sorted(self.endpoints.items())},
+        }
+
+    def to_prometheus(self) -> str:
+        lines = []
+
+        def histogram(metric: str, help_text: str, attr: str) -> None:
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} histogram")
+            for name, m in sorted(self.endpoints.items()):
+                h: Histogram = getattr(m, attr)
+                if not h.count:
+                    continue
+                cumulative = 0
+                for bound, n in zip([*map(str, h.bounds), "+Inf"], h.counts):
+                    cumulative += n
+                    lines.append(f'{metric}_bucket{{endpoint="{name}",le="{bound}"}} {cumulative}')
+                lines.append(f'{metric}_sum{{endpoint="{name}"}} {h.sum:.6f}')
+                lines.append(f'{metric}_count{{endpoint="{name}"}} {h.count}')
+
+        histogram("infocar_request_duration_seconds", "Time spent waiting for Info-Car and CapMonster.", "latency")
+        histogram("infocar_parse_duration_seconds", "Time spent decoding responses.", "parse")
+
+        lines.append("# HELP infocar_responses_total Responses by status code.")
+        lines.append("# TYPE infocar_responses_total counter")
+        for name, m in sorted(self.endpoints.items()):
+            for status, n in sorted(m.statuses.items()):
+                lines.append(f'infocar_responses_total{{endpoint="{name}",status="{status}"}} {n}')
+
+        for metric, attr, help_text in (
+            ("infocar_sent_bytes_total", "bytes_sent", "Request body bytes sent."),
+            ("infocar_received_bytes_total", "bytes_received", "Response bytes received."),
+        ):
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} counter")
+            for name, m in sorted(self.endpoints.items()):
+                lines.append(f'{metric}{{endpoint="{name}"}} {getattr(m, attr)}')
+
+        return "\n".join(lines) + "\n"
+
+
+def export_metrics(metrics: Metrics, path: Path) -> None:
+    """Write ``metrics`` to ``path``: a snapshot line appended for ``.jsonl``, Prometheus text otherwise.
+
+    The Prometheus file is replaced atomically, so it can be served by node_exporter's
+    textfile collector as is.
+    """
+    if path.suffix == ".jsonl":
+        with path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(metrics.snapshot()) + "\n")
+        return
+
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(metrics.to_prometheus(), encoding="utf-8")
+    os.replace(tmp, path)
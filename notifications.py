@@ -0,0 +1,182 @@
+"""Notifications (sound, terminal bell, desktop, webhook) delivered off the polling path.
+
+``Notifier.notify`` only puts the notification on a queue; a background thread hands it
+to every sink. Sinks import whatever they need on first use and drop notifications that
+come in faster than their ``min_interval``, so a burst of matches cannot spam anyone.
+"""
+from __future__ import annotations
+
+import json
+import queue
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import TYPE_CHECKING, Any, Optional
+
+if TYPE_CHECKING:
+    from config_manager import AppConfig
+
+ALERT_SOUND = "alert.mp3"
+
+
+@dataclass
+class Notification:
+    title: str
+    message: str
+    # What happened, e.g. "match", "rescheduled" or "reschedule_failed"
+    kind: str = "info"
+    data: dict[str, Any] = field(default_factory=dict)
+
+
+class NotificationSink:
+    """Delivers notifications somewhere; ``send`` runs on the notifier thread and may block.
+
+    Only notifications whose kind is in ``kinds`` (all, if None) are sent, and at most
+    one of each kind per ``min_interval`` seconds.
+    """
+
+    name = "sink"
+
+    def __init__(self, min_interval: float = 10.0, kinds: Optional[tuple[str, ...]] = None) -> None:
+        self.min_interval = min_interval
+        self.kinds = kinds
+        self.last_sent: dict[str, float] = {}
+        self.sent = 0
+        self.suppressed = 0
+        self.errors = 0
+        self.last_error: Optional[Exception] = None
+
+    def allow(self, kind: str, now: float) -> bool:
+        if self.kinds is not None and kind not in self.kinds:
+            return False
+        last = self.last_sent.get(kind)
+        if last is not None and now - last < self.min_interval:
+            self.suppressed += 1
+            return False
+        self.last_sent[kind] = now
+        return True
+
+    def send(self, notification: Notification) -> None:
+        raise NotImplementedError
+
+
+class SoundSink(NotificationSink):
+    name = "sound"
+
+    def __init__(self, sound: str = ALERT_SOUND, min_interval: float = 10.0, kinds: Optional[tuple[str, ...]] = ("match",)) -> None:
+        super().__init__(min_interval, kinds)
+        self.sound = sound
+
+    def send(self, notification: Notification) -> None:
+        # Loading an audio backend is slow, so only do it once there is something to play
+        import playsound3
+
+        playsound3.playsound(self.sound, block=False)
+
+
+class BellSink(NotificationSink):
+    name = "bell"
+
+    def __init__(self, stream=None, min_interval: float = 2.0, kinds: Optional[tuple[str, ...]] = ("match",)) -> None:
+        super().__init__(min_interval, kinds)
+        self.stream = stream
+
+    def send(self, notification: Notification) -> None:
+        stream = self.stream or sys.__stderr__
+        stream.write("\a")
+        stream.flush()
+
+
+class DesktopSink(NotificationSink):
+    """Uses notify-send on Linux and osascript on macOS; elsewhere it does nothing."""
+
+    name = "desktop"
+
+    def send(self, notification: Notification) -> None:
+        if sys.platform == "darwin":
+            script = f"display notification {json.dumps(notification.message)} with title {json.dumps(notification.title)}"
+            cmd = ["osascript", "-e", script]
+        elif shutil.which("notify-send"):
+            cmd = ["notify-send", "--app-name=Info-Car Sniper", notification.title, notification.message]
+        else:
+            return
+        subprocess.run(cmd, check=True, timeout=10, capture_output=True)
+
+
+class WebhookSink(NotificationSink):
+    """POSTs every notification as JSON to ``url``."""
+
+    name = "webhook"
+
+    def __init__(self, url: str, timeout: float = 10.0, min_interval: float = 5.0, kinds: Optional[tuple[str, ...]] = None) -> None:
+        super().__init__(min_interval, kinds)
+        self.url = url
+        self.timeout = timeout
+
+    def send(self, notification: Notification) -> None:
+        import httpx
+
+        resp = httpx.post(self.url, json=asdict(notification), timeout=self.timeout)
+        resp.raise_for_status()
+
+
+class Notifier:
+    """Fans notifications out to ``sinks`` on a background thread."""
+
+    _STOP = object()
+
+    def __init__(self, sinks: list[NotificationSink]) -> None:
+        self.sinks = sinks
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, cfg: "AppConfig") -> "Notifier":
+        sinks: list[NotificationSink] = []
+        if cfg.notify_sound:
+            sinks.append(SoundSink())
+        if cfg.notify_bell:
+            sinks.append(BellSink())
+        if cfg.notify_desktop:
+            sinks.append(DesktopSink())
+        if cfg.notify_webhook:
+            sinks.append(WebhookSink(cfg.notify_webhook))
+        return cls(sinks)
+
+    def notify(self, notification: Notification) -> None:
+        """Queue ``notification``; never blocks."""
+        if not self.sinks:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="notifier", daemon=True)
+                self._thread.start()
+        self._queue.put(notification)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Deliver what is still queued (waiting at most ``timeout`` seconds) and stop."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(self._STOP)
+            thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            notification = self._queue.get()
+            if notification is self._STOP:
+                return
+            now = time.monotonic()
+            for sink in self.sinks:
+                if not sink.allow(notification.kind, now):
+                    continue
+                try:
+                    sink.send(notification)
+                    sink.sent += 1
+                except Exception as e:
+                    sink.errors += 1
+                    sink.last_error = e
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import date
+from typing import Any, Callable, Optional, TYPE_CHECKING
+
+from exam_schedule import Exam, Schedule, ScheduleSet
+from infocar import AuthenticationError, PRACTICE_EXAM_TYPE
+from poll_scheduler import AdaptivePollScheduler, PollScheduler
+from slot_events import ScheduleDiffer, SlotAppeared, SlotEvent
+from slot_filter import SlotFilter
+
+if TYPE_CHECKING:
+    from app_state import Stats
+    from history_store import HistoryStore
+    from infocar import InfoCarSession
+
+
+class PollEngine:
+    """Polls the exam schedule until a matching slot shows up.
+
+    The engine runs as a single asyncio task on the current loop and only talks to
+    the outside world through callbacks, so the TUI and headless runners share it:
+
+    - ``on_schedules(schedules)`` after every successful fetch, with the schedules of all
+      exam types, so other consumers can share the poll instead of fetching again
+    - ``on_update(events)`` after every successful poll (``events`` is empty if unchanged)
+    - ``on_error(error)`` when a poll fails or the slot history cannot be written
+    - ``on_match(exam)`` once, when a slot matching the filter appears; polling stops
+    - ``on_auth_error(error)`` when the access token is rejected; polling stops
+
+    An error raised by a callback goes to ``on_error`` and polling carries on; if handling
+    a match failed, the next poll looks for it again.
+
+    ``set_filter()`` changes the search preferences of a running engine, and
+    ``stop()`` cancels the task right away, including an in-flight request or wait.
+    """
+
+    def __init__(
+        self,
+        session: "InfoCarSession",
+        reservation: dict[str, Any],
+        slot_filter: SlotFilter,
+        stats: "Stats",
+        differ: Optional[ScheduleDiffer] = None,
+        scheduler: Optional[PollScheduler] = None,
+        on_update: Optional[Callable[[list[SlotEvent]], None]] = None,
+        on_error: Optional[Callable[[Exception], None]] = None,
+        on_match: Optional[Callable[[Exam], None]] = None,
+        on_auth_error: Optional[Callable[[AuthenticationError], None]] = None,
+        history: Optional["HistoryStore"] = None,
+        exam_type: str = PRACTICE_EXAM_TYPE,
+        on_schedules: Optional[Callable[[ScheduleSet], None]] = None,
+    ) -> None:
+        self.session = session
+        self.reservation = reservation
+        self.slot_filter = slot_filter
+        self.stats = stats
+        self.differ = differ or ScheduleDiffer()
+        self.scheduler = scheduler or AdaptivePollScheduler()
+        self.history = history
+        self.exam_type = exam_type
+
+        self.on_schedules = on_schedules
+        self.on_update = on_update
+        self.on_error = on_error
+        self.on_match = on_match
+        self.on_auth_error = on_auth_error
+
+        self._task: Optional[asyncio.Task] = None
+        self._wake = asyncio.Event()
+        # The differ may come from an earlier engine with another filter (e.g. after a
+        # re-login with new preferences), so the first poll checks every open slot
+        self._rescan = True
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._task = asyncio.get_running_loop().create_task(self._run(), name="poll-engine")
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+
+    async def join(self) -> None:
+        if self._task is None:
+            return
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    def wake(self) -> None:
+        """Cut the current wait short and poll again now."""
+        self._wake.set()
+
+    def set_filter(self, slot_filter: SlotFilter) -> Optional[Exam]:
+        """Search with ``slot_filter`` from now on, without a new request.
+
+        Slots that are already open were only checked against the old filter, so the
+        last schedule seen is matched again. If it has a match, polling stops and
+        ``on_match`` is called just as for a polled match. Returns that exam, if any.
+        Otherwise the next poll checks every open slot, as the new span may bring back
+        slots the differ already knows.
+        """
+        self.slot_filter = slot_filter
+        previous = self.differ.previous
+        exam = previous.earliest_matching(slot_filter) if previous is not None else None
+        if exam is not None and self.running:
+            self.stop()
+            if self.on_match is not None:
+                self.on_match(exam)
+        if exam is None:
+            self._rescan = True
+        return exam
+
+    async def poll_once(self) -> tuple[list[SlotEvent], Optional[Exam]]:
+        """Fetch the schedule once and process it, see ``process``."""
+        span = self.slot_filter.span()
+        if span is None:
+            # The filter can never match (every day excluded or without hours): nothing to fetch
+            return [], None
+        schedules = await self.session.get_schedules(
+            word_id=self.reservation['exam']['organizationUnitId'],
+            start_date=span[0],
+            end_date=span[1],
+        )
+        if self.on_schedules is not None:
+            self.on_schedules(schedules)
+        return self.process(schedules.of(self.exam_type), schedules.span)
+
+    def process(self, schedule: Schedule, span: Optional[tuple[date, date]] = None) -> tuple[list[SlotEvent], Optional[Exam]]:
+        """Update stats from one poll of the days in ``span`` (every day if None).
+
+        Returns the slot events since the previous poll and the earliest exam matching
+        the search window, if any. Slots known from before on days outside ``span`` are
+        not reported as gone, see ``ScheduleDiffer``.
+        """
+        self.stats.all_checks += 1
+
+        events = self.differ.update(schedule, span)
+        if events:
+            self.stats.apply(events)
+        self.stats.sample_trend()
+        match = self._match(schedule, events)
+        if self.history is not None:
+            # The events are used up by now, so a failed write must not lose the match
+            try:
+                self.history.record(schedule, events, self.stats, span)
+            except Exception as e:
+                if self.on_error is not None:
+                    self.on_error(e)
+        return events, match
+
+    def _match(self, schedule: Schedule, events: list[SlotEvent]) -> Optional[Exam]:
+        if self._rescan:
+            self._rescan = False
+            return schedule.earliest_matching(self.slot_filter)
+
+        # Polling stops on the first match, so only slots that just appeared can match now
+        # (the first poll and set_filter check the open ones too)
+        match = None
+        for event in events:
+            if isinstance(event, SlotAppeared) and self.slot_filter.matches(event.key):
+                if match is None or event.key < match.key:
+                    match = event
+        return match.to_exam() if match is not None else None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                events, exam = await self.poll_once()
+            except AuthenticationError as e:
+                self._callback(self.on_auth_error, e)
+                return
+            except Exception as e:
+                self._callback(self.on_error, e)
+                delay = self.scheduler.on_error(e)
+            else:
+                if exam is not None:
+                    if self._callback(self.on_match, exam):
+                        return
+                    # Handling the match failed; look at every open slot again next time
+                    self._rescan = True
+                self._callback(self.on_update, events)
+                delay = self.scheduler.on_success(bool(events))
+
+            await self._wait(delay)
+
+    def _callback(self, callback: Optional[Callable], *args) -> bool:
+        """Call ``callback``; an error in it goes to ``on_error`` instead of ending polling."""
+        if callback is None:
+            return True
+        try:
+            callback(*args)
+            return True
+        except Exception as e:
+            try:
+                if self.on_error is None or callback is self.on_error:
+                    raise
+                self.on_error(e)
+            except Exception:
+                asyncio.get_running_loop().call_exception_handler({
+                    "message": "Unhandled error in a PollEngine callback",
+                    "exception": e,
+                    "task": self._task,
+                })
+            return False
+
+    async def _wait(self, delay: float) -> None:
+        self._wake.clear()
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            pass
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import random
+from typing import Optional
+
+
+class PollScheduler:
+    """Decides how long to wait before the next poll.
+
+    The poll loop reports the outcome of every poll and sleeps for whatever delay
+    is returned. Subclass it to plug in a different policy.
+    """
+
+    def on_success(self, changed: bool) -> float:
+        raise NotImplementedError
+
+    def on_error(self, error: Exception) -> float:
+        raise NotImplementedError
+
+
+class FixedPollScheduler(PollScheduler):
+    """Always waits the same amount of time."""
+
+    def __init__(self, interval: float = 15.0) -> None:
+        self.interval = interval
+
+    def on_success(self, changed: bool) -> float:
+        return self.interval
+
+    def on_error(self, error: Exception) -> float:
+        return self.interval
+
+
+class AdaptivePollScheduler(PollScheduler):
+    """Polls every ``interval`` seconds, backs off on errors and slows down when idle.
+
+    - Errors back off exponentially from ``error_delay`` up to ``max_error_delay``,
+      with random jitter so several instances do not retry in lockstep.
+    - A ``Retry-After`` sent by the server (``error.retry_after``) is always honored.
+    - After ``idle_after`` polls in a row without a change, the interval grows by
+      ``idle_factor`` per poll up to ``max_idle_interval``; any change resets it.
+    """
+
+    def __init__(
+        self,
+        interval: float = 15.0,
+        error_delay: float = 3.0,
+        max_error_delay: float = 300.0,
+        idle_after: int = 40,
+        idle_factor: float = 1.1,
+        max_idle_interval: float = 30.0,
+        jitter: float = 0.1,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        self.interval = interval
+        self.error_delay = error_delay
+        self.max_error_delay = max_error_delay
+        self.idle_after = idle_after
+        self.idle_factor = idle_factor
+        self.max_idle_interval = max_idle_interval
+        self.jitter = jitter
+        self.rng = rng or random.Random()
+
+        self.errors = 0
+        self.unchanged = 0
+        self.current_interval = interval
+
+    def on_success(self, changed: bool) -> float:
+        self.errors = 0
+        if changed:
+            self.unchanged = 0
+            self.current_interval = self.interval
+        else:
+            self.unchanged += 1
+            if self.unchanged >= self.idle_after:
+                self.current_interval = min(self.max_idle_interval, self.current_interval * self.idle_factor)
+        return self._jittered(self.current_interval)
+
+    def on_error(self, error: Exception) -> float:
+        self.errors += 1
+        backoff = min(self.max_error_delay, self.error_delay * 2 ** (self.errors - 1))
+        # "Equal jitter": keep at least half of the backoff, randomize the rest
+        delay = backoff / 2 + self.rng.uniform(0, backoff / 2)
+
+        retry_after = getattr(error, "retry_after", None)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def _jittered(self, delay: float) -> float:
+        return delay * (1 + self.rng.uniform(-self.jitter, self.jitter))
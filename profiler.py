@@ -0,0 +1,148 @@
+"""Opt-in profiling for long sessions (``--profile DIR`` on ``main.py`` and ``headless.py``).
+
+A background thread samples the stack of the event-loop thread (where polling, parsing
+and rendering happen) and writes it out in the collapsed "folded" format that
+flamegraph.pl and speedscope read. It also takes ``tracemalloc`` snapshots. Each
+snapshot is written both raw, for ``tracemalloc.Snapshot.load``, and as a
+top-allocations report diffed against the previous one, which makes slow growth stand
+out. Only the newest ``keep`` dumps of each kind are kept.
+"""
+from __future__ import annotations
+
+import sys
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from types import FrameType
+from typing import Optional
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    path = Path(code.co_filename)
+    where = f"{path.parent.name}/{path.name}" if path.parent.name else path.name
+    return f"{code.co_name} ({where}:{code.co_firstlineno})"
+
+
+class Profiler:
+    def __init__(
+        self,
+        directory: Path,
+        thread: Optional[threading.Thread] = None,
+        sample_interval: float = 0.01,
+        dump_interval: float = 300.0,
+        snapshot_interval: float = 600.0,
+        keep: int = 12,
+        traceback_frames: int = 10,
+    ) -> None:
+        self.directory = Path(directory)
+        self.thread = thread or threading.current_thread()
+        self.sample_interval = sample_interval
+        self.dump_interval = dump_interval
+        self.snapshot_interval = snapshot_interval
+        self.keep = keep
+        self.traceback_frames = traceback_frames
+
+        self.samples: dict[str, int] = {}
+        self._previous_snapshot: Optional[tracemalloc.Snapshot] = None
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        self._started_tracemalloc = False
+
+    def start(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.traceback_frames)
+            self._started_tracemalloc = True
+        self._stop.clear()
+        self._sampler = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._sampler.start()
+
+    def stop(self) -> None:
+        """Stop sampling and write whatever was collected since the last dump."""
+        if self._sampler is None:
+            return
+        self._stop.set()
+        self._sampler.join()
+        self._sampler = None
+        self.dump_samples()
+        self.dump_snapshot()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def __enter__(self) -> "Profiler":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def sample(self) -> None:
+        frame = sys._current_frames().get(self.thread.ident)
+        if frame is None:
+            return
+        stack = []
+        while frame is not None:
+            stack.append(_frame_label(frame))
+            frame = frame.f_back
+        stack.reverse()
+        key = ";".join(stack)
+        self.samples[key] = self.samples.get(key, 0) + 1
+
+    def dump_samples(self) -> Optional[Path]:
+        samples, self.samples = self.samples, {}
+        if not samples:
+            return None
+        path = self._path("cpu", "folded")
+        path.write_text("".join(f"{stack} {n}\n" for stack, n in sorted(samples.items())), encoding="utf-8")
+        self._rotate("cpu-*.folded")
+        return path
+
+    def dump_snapshot(self, top: int = 40) -> Optional[Path]:
+        if not tracemalloc.is_tracing():
+            return None
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ))
+        current, peak = tracemalloc.get_traced_memory()
+
+        path = self._path("mem", "txt")
+        snapshot.dump(str(path.with_suffix(".tracemalloc")))
+
+        lines = [f"traced {current / 1024:.1f} KiB, peak {peak / 1024:.1f} KiB", "", f"Top {top} by size:"]
+        lines += [str(stat) for stat in snapshot.statistics("lineno")[:top]]
+        if self._previous_snapshot is not None:
+            lines += ["", f"Top {top} changes since the previous snapshot:"]
+            lines += [str(stat) for stat in snapshot.compare_to(self._previous_snapshot, "lineno")[:top]]
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        self._previous_snapshot = snapshot
+
+        self._rotate("mem-*.txt")
+        self._rotate("mem-*.tracemalloc")
+        return path
+
+    def _run(self) -> None:
+        now = time.monotonic()
+        next_dump = now + self.dump_interval
+        next_snapshot = now + self.snapshot_interval
+        while not self._stop.wait(self.sample_interval):
+            self.sample()
+            now = time.monotonic()
+            if now >= next_dump:
+                self.dump_samples()
+                next_dump = now + self.dump_interval
+            if now >= next_snapshot:
+                self.dump_snapshot()
+                next_snapshot = now + self.snapshot_interval
+
+    def _path(self, kind: str, suffix: str) -> Path:
+        return self.directory / f"{kind}-{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}.{suffix}"
+
+    def _rotate(self, pattern: str) -> None:
+        # Timestamped names sort chronologically
+        for old in sorted(self.directory.glob(pattern))[:-self.keep]:
+            old.unlink(missing_ok=True)
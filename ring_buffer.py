@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import math
+import time
+from array import array
+from typing import Callable, Optional, Sequence
+
+
+class RingBuffer:
+    """Fixed-capacity buffer of numbers in a flat ``array``; the oldest value is overwritten."""
+
+    __slots__ = ("capacity", "_data", "_next", "_len")
+
+    def __init__(self, capacity: int, typecode: str = "d") -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._data = array(typecode, [0]) * capacity
+        self._next = 0
+        self._len = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def append(self, value) -> None:
+        self._data[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        if self._len < self.capacity:
+            self._len += 1
+
+    def replace_last(self, value) -> None:
+        if not self._len:
+            raise IndexError("replace_last on an empty RingBuffer")
+        self._data[self._next - 1] = value
+
+    def last(self):
+        if not self._len:
+            raise IndexError("last on an empty RingBuffer")
+        return self._data[self._next - 1]
+
+    def values(self) -> array:
+        """Copy of the contents, oldest first."""
+        if self._len < self.capacity:
+            return self._data[:self._len]
+        return self._data[self._next:] + self._data[:self._next]
+
+
+def downsample(values: Sequence[float], width: int, reduce: Callable[[Sequence[float]], float] = max) -> list[float]:
+    """Reduce ``values`` to at most ``width`` points, one per equal-sized bucket.
+
+    Each bucket is a slice handed to ``reduce`` as a whole (``min``/``max`` run in C),
+    so the cost does not grow with per-element Python work.
+    """
+    n = len(values)
+    if n <= width:
+        return list(values)
+    bounds = [n * i // width for i in range(width + 1)]
+    return [reduce(values[bounds[i]:bounds[i + 1]]) for i in range(width)]
+
+
+class TrendHistory:
+    """Earliest open slot and number of open slots over time, at most one sample per ``interval``.
+
+    ``capacity`` samples are kept (a day at one per minute by default), so memory stays
+    flat however long the session runs. ``version`` changes whenever the data does.
+    """
+
+    def __init__(self, capacity: int = 1440, interval: float = 60.0) -> None:
+        self.interval = interval
+        self.times = RingBuffer(capacity, "d")
+        # Date key of the earliest open slot, +inf while there is none
+        self.earliest = RingBuffer(capacity, "d")
+        self.open_slots = RingBuffer(capacity, "l")
+        self.version = 0
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def record(self, earliest_key: Optional[int], open_slots: int, now: Optional[float] = None) -> None:
+        now = time.time() if now is None else now
+        earliest = math.inf if earliest_key is None else float(earliest_key)
+        if len(self.times) and now - self.times.last() < self.interval:
+            # Same bucket: keep the best earliest slot and the latest count
+            earliest = min(earliest, self.earliest.last())
+            if earliest == self.earliest.last() and open_slots == self.open_slots.last():
+                return
+            self.earliest.replace_last(earliest)
+            self.open_slots.replace_last(open_slots)
+        else:
+            self.times.append(now)
+            self.earliest.append(earliest)
+            self.open_slots.append(open_slots)
+        self.version += 1
+
+    def earliest_series(self, width: int) -> list[float]:
+        """Earliest slot per point, downsampled to ``width``; gaps without slots show as the latest date seen."""
+        points = downsample(self.earliest.values(), width, min)
+        finite = [p for p in points if p != math.inf]
+        if not finite:
+            return []
+        worst = max(finite)
+        return [p if p != math.inf else worst for p in points]
+
+    def open_slots_series(self, width: int) -> list[float]:
+        return downsample(self.open_slots.values(), width, max)
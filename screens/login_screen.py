@@ -6,17 +6,29 @@ from textual.widgets import Button, Input, Label, Static
 from textual.screen import Screen
 from textual.binding import Binding
 
+import asyncio
+from dataclasses import replace
 from datetime import datetime, timedelta
 import re
-import threading
 
-from capmonster_provider import CapmonsterProvider
-from infocar import InfoCarSession
 from app_state import AppState
-from config_manager import AppConfig, load_config, save_config
+from config_manager import load_config, save_config, validate_config
+from notifications import Notifier
+from token_cache import TOKEN_CACHE_PATH
 
 from widgets.spinner import Spinner
-from screens.main_screen import MainScreen
+
+
+def _import_session_modules() -> None:
+    """Imports everything logging in and polling need.
+
+    capmonster_python (pydantic), httpx and the main screen take a good part of startup,
+    so they are loaded only once a login starts, off the event loop so the spinner keeps going.
+    """
+    import capmonster_python  # noqa: F401
+    import infocar  # noqa: F401
+    import screens.main_screen  # noqa: F401
+
 
 class LoginScreen(Screen):
     BINDINGS = [
@@ -288,75 +300,79 @@ class LoginScreen(Screen):
             self.set_focus(date_to_in)
             return
 
+        cfg = replace(
+            load_config(),
+            username=username.value,
+            password=password.value,
+            capmonster_key=capmonster.value,
+            date_from=date_from,
+            date_to=date_to,
+            hour_from=hour_from,
+            hour_to=hour_to,
+        )
+
+        # Extra windows from config.json are validated here so a typo does not kill polling later
+        try:
+            validate_config(cfg)
+        except ValueError as e:
+            errors.remove_class("hidden")
+            errors.update(f"Invalid search preferences in config.json: {e}")
+            return
+
         ticker_text.update("Checking Capmonster balance…")
         ticker_container.remove_class("hidden")
 
-        def do_login():
+        async def do_login():
             try:
-                try:
-                    provider = CapmonsterProvider(capmonster.value)
-                    balance = provider.get_balance()
-                except Exception as e:
-                    raise e
-            
-                if balance <= 0:
-                    raise Exception("CapMonster balance is 0. Please top up.")
-                
-                proxies = []
-
-                try:
-                    with open("proxies.txt", "r") as f:
-                        proxies = f.read().splitlines()
-                except:
-                    pass
+                await asyncio.to_thread(_import_session_modules)
+                from infocar import InfoCarSession, load_proxies
+                from screens.main_screen import MainScreen
 
-                self.app.call_from_thread(ticker_text.update, "Logging in to Info-Car…")
+                proxies = load_proxies()
 
                 # Reuse existing session if available; otherwise create new
                 app_state: AppState = getattr(self.app, "state", AppState())
                 if app_state.session is None:
-                    app_state.session = InfoCarSession(capmonster.value, proxies=proxies)
+                    app_state.session = InfoCarSession(
+                        capmonster.value,
+                        proxies=proxies,
+                        token_cache_path=TOKEN_CACHE_PATH,
+                        cassette=getattr(self.app, "cassette", None),
+                    )
                 else:
                     # Update capmonster key/proxies if changed
-                    app_state.session.capmonster = app_state.session.capmonster.__class__(api_key=capmonster.value)
-                    app_state.session.proxies = proxies
+                    await app_state.session.reconfigure(capmonster.value, proxies)
                 infocar_session = app_state.session
-                infocar_session.login(username.value, password.value)
 
-                self.app.call_from_thread(ticker_text.update, "Fetching reservations…")
-                
-                reservations = infocar_session.get_account_reservations()
+                balance = await infocar_session.get_capmonster_balance()
+                if balance <= 0:
+                    raise Exception("CapMonster balance is 0. Please top up.")
+
+                ticker_text.update("Logging in to Info-Car…")
+                reservations = await infocar_session.login_or_resume(username.value, password.value)
                 reservation = reservations[0]
 
-                self.app.call_from_thread(ticker_text.update, "Verifying details…")
+                ticker_text.update("Verifying details…")
 
-                if not infocar_session.is_reschedule_enabled_for_word(reservation['exam']['organizationUnitId']):
+                if not await infocar_session.is_reschedule_enabled_for_word(reservation['exam']['organizationUnitId']):
                     raise Exception("Rescheduling is not enabled for your driving test center.")
 
-                cfg = AppConfig(
-                    username=username.value,
-                    password=password.value,
-                    capmonster_key=capmonster.value,
-                    date_from=date_from,
-                    date_to=date_to,
-                    hour_from=hour_from,
-                    hour_to=hour_to,
-                )
                 save_config(cfg)
                 # Persist in global state
                 app_state.cfg = cfg
                 app_state.reservation = reservation
+                if app_state.notifier is not None:
+                    app_state.notifier.close(timeout=0)
+                app_state.notifier = Notifier.from_config(cfg)
 
-                self.app.call_from_thread(self.app.switch_screen, MainScreen(session=infocar_session, cfg=cfg, reservation=reservation))
+                self.app.switch_screen(MainScreen(session=infocar_session, cfg=cfg, reservation=reservation))
             except Exception as e:
-                def handle_login_error():
-                    ticker_text.text = ""
-                    ticker_container.add_class("hidden")
-                    errors.remove_class("hidden")
-                    errors.update(str(e))
-
-                self.app.call_from_thread(handle_login_error)
+                ticker_text.text = ""
+                ticker_container.add_class("hidden")
+                errors.remove_class("hidden")
+                errors.update(str(e))
             finally:
-                self.app.call_from_thread(ticker_container.add_class, "hidden")
+                ticker_container.add_class("hidden")
 
-        threading.Thread(target=do_login, daemon=True).start()
+        # Runs on the app's event loop; cancelled automatically if this screen goes away
+        self.run_worker(do_login(), name="login", group="login", exclusive=True)
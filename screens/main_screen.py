@@ -5,25 +5,36 @@ from textual.screen import Screen
 from textual.binding import Binding
 from textual.containers import Container, Center, Horizontal
 from textual.widgets import Static
-import playsound3
+from textual.reactive import reactive
 
 from datetime import datetime, timedelta
 import time
-import threading
 import random
 
-from infocar import AuthenticationError, InfoCarSession, PRACTICE_EXAM_TYPE
-from config_manager import AppConfig
+from infocar import InfoCarSession
+from config_manager import AppConfig, ConfigWatcher
+from poll_engine import PollEngine
+from poll_scheduler import PollScheduler
+from slot_filter import SlotFilter
 from widgets.spinner import Spinner
 
 from widgets.stat_panel import StatPanel
+from widgets.metrics_panel import MetricsPanel
+from widgets.trend_panel import TrendPanel
 from constants import FUNNY_TICKER_WAITING_TEXTS
+from notifications import Notification, Notifier
 from screens.reschedule_screen import RescheduleScreen
 from app_state import AppState
 
+# The banner, the ticker and the config.json check share one timer; the ticker
+# changes every TICKER_TICKS ticks
+TIMER_INTERVAL = 5.0
+TICKER_TICKS = 3
+
 class MainScreen(Screen):
     BINDINGS = [
         Binding("ctrl+l", "logout", "Logout", show=False, priority=True),
+        Binding("ctrl+t", "toggle_timings", "Request timings", show=False, priority=True),
     ]
 
     CSS = """
@@ -72,19 +83,33 @@ class MainScreen(Screen):
             color: white;
             text-style: bold;
         }
+
+        #timings {
+            padding-top: 1;
+        }
+
+        .hidden {
+            display: none;
+        }
     """
 
-    def __init__(self, session: InfoCarSession, cfg: AppConfig, reservation) -> None:
+    # "Searching for …" banner text; repainted only when the shown minutes change
+    elapsed: reactive[str] = reactive("0m", init=False)
+
+    def __init__(self, session: InfoCarSession, cfg: AppConfig, reservation, scheduler: PollScheduler | None = None) -> None:
         super().__init__()
         self.session = session
+        self.scheduler = scheduler
         self.cfg = cfg
         self.reservation = reservation
 
         self.ticker = None
-        self.running = False
-        self.poll_thread = None
-        self._ticker_timer = None
+        self.engine = None
+        self._timer = None
+        self._ticks = 0
         self.stats = None
+        self.slot_filter = SlotFilter.from_config(cfg)
+        self.config_watcher: ConfigWatcher | None = None
 
     def compose(self) -> ComposeResult:
         reservation_date = time.strptime(self.reservation['exam']['practice']['date'], "%Y-%m-%dT%H:%M:%S")
@@ -97,10 +122,12 @@ class MainScreen(Screen):
             StatPanel("Earliest ever exam date", id="earliest_ever"),
             StatPanel("Current earliest exam date", id="current_earliest"),
             StatPanel("Last found exam date", id="last_found"),
+            TrendPanel(id="trend"),
+            MetricsPanel(id="timings", classes="hidden"),
             Static(),
             Center(Static(f"{time.strftime('%Y-%m-%d %H:%M', reservation_date)} at {self.reservation['exam']['organizationUnitName']}")),
-            Center(Static(f"Searching dates: {self.cfg.date_from} → {self.cfg.date_to}")),
-            Center(Static(f"Searching hours: {self.cfg.hour_from} → {self.cfg.hour_to}")),
+            Center(Static(self._dates_text(), id="search_dates")),
+            Center(Static(self._hours_text(), id="search_hours")),
             Static(),
             Center(
                 Horizontal(
@@ -114,12 +141,23 @@ class MainScreen(Screen):
         )
 
         main_container.border_title = "Info-Car Sniper"
-        main_container.border_subtitle = "Ctrl+l logout • Ctrl+c exit"
+        main_container.border_subtitle = "Ctrl+l logout • Ctrl+t timings • Ctrl+c exit"
 
         yield main_container
 
     def on_mount(self) -> None:
         self.last_error_panel = self.query_one("#last_error")
+        self.searching_for: Static = self.query_one("#searching_for")
+        self.ticker_text: Static = self.query_one("#ticker_text")
+        self.turnstile_panel: StatPanel = self.query_one("#turnstile")
+        self.all_checks_panel: StatPanel = self.query_one("#all_checks")
+        self.earliest_ever_panel: StatPanel = self.query_one("#earliest_ever")
+        self.current_earliest_panel: StatPanel = self.query_one("#current_earliest")
+        self.last_found_panel: StatPanel = self.query_one("#last_found")
+        self.timings: MetricsPanel = self.query_one("#timings")
+        self.trend: TrendPanel = self.query_one("#trend")
+        self.search_dates: Static = self.query_one("#search_dates")
+        self.search_hours: Static = self.query_one("#search_hours")
         # Attach shared state
         app_state: AppState = getattr(self.app, "state")
         self.stats = app_state.stats
@@ -127,155 +165,145 @@ class MainScreen(Screen):
         # If re-entered, prefer persisted cfg/reservation if available
         if getattr(app_state, "cfg", None) is not None:
             self.cfg = app_state.cfg  # type: ignore
+            self.slot_filter = SlotFilter.from_config(self.cfg)
         if getattr(app_state, "reservation", None) is not None:
             self.reservation = app_state.reservation
 
-        try:
-            if app_state.started_checking_at is None:
-                app_state.started_checking_at = datetime.now()
+        if app_state.started_checking_at is None:
+            app_state.started_checking_at = datetime.now()
+        self.elapsed = self._compute_elapsed_text_safe()
 
-            searching_for = self._compute_elapsed_text_safe()
-            self.query_one("#searching_for", Static).update(f"Searching for {searching_for}")
-        except Exception:
-            pass
-
-        self.running = True
         self.update_panels()
 
-        self.poll_thread = threading.Thread(target=self.poll_loop, daemon=True)
-        self.poll_thread.start()
-
-        def _rotate_ticker_text_event() -> None:
-            try:
-                ticker_text_widget: Static = self.query_one("#ticker_text")
-                ticker_text_widget.update(random.choice(FUNNY_TICKER_WAITING_TEXTS))
-            except Exception:
-                pass
+        # Replaces (and stops) any poller left over from a previous MainScreen
+        self.engine = PollEngine(
+            session=self.session,
+            reservation=self.reservation,
+            slot_filter=self.slot_filter,
+            stats=self.stats,
+            differ=app_state.differ,
+            scheduler=self.scheduler,
+            on_update=self.on_poll_update,
+            on_error=self.on_poll_error,
+            on_match=self.on_poll_match,
+            on_auth_error=self.on_poll_auth_error,
+            history=app_state.history,
+        )
+        app_state.start_polling(self.engine)
 
-        self._ticker_timer = self.set_interval(15.0, _rotate_ticker_text_event)
-        # Also update elapsed banner every 10s
-        self.set_interval(10.0, self._update_elapsed_banner)
+        # Edits to config.json from here on are picked up without logging in again
+        self.config_watcher = ConfigWatcher()
+        self._timer = self.set_interval(TIMER_INTERVAL, self._tick)
 
     def on_unmount(self) -> None:
-        if self._ticker_timer is not None:
-            try:
-                self._ticker_timer.stop()
-            except Exception:
-                pass
+        app_state: AppState = getattr(self.app, "state")
+        if app_state.poll_engine is self.engine:
+            app_state.stop_polling()
+
+        if self._timer is not None:
+            self._timer.stop()
 
     def action_logout(self) -> None:
-        self.running = False
+        app_state: AppState = getattr(self.app, "state")
+        app_state.stop_polling()
 
         # Lazy import to avoid circular import at module load time
         from screens.login_screen import LoginScreen
         self.app.switch_screen(LoginScreen())
 
-    def poll_loop(self):
-        try:
-            while self.running:
-                try:
-                    exams = []
-
-                    for retry in range(5):
-                        try:
-                            exams = self.session.get_exams(
-                                PRACTICE_EXAM_TYPE,
-                                word_id=self.reservation['exam']['organizationUnitId'],
-                            )
-                            break
-                        except AuthenticationError as e:
-                            self.running = False
-                            # Lazy import to avoid circular import at module load time
-                            from screens.login_screen import LoginScreen
-                            self.app.call_from_thread(self.app.switch_screen, LoginScreen(auto_login=True))
-                            return
-                        except Exception as e:
-                            if retry == 4:
-                                raise e
-                            
-                            self.app.call_from_thread(self.last_error_panel.update, f"[red]{str(e)}[/red]")
-                            time.sleep(3)
-                            continue
-
-                    earliest_time = exams[0].date
-                    for exam in exams[1:]:
-                        if exam.date < earliest_time:
-                            earliest_time = exam.date
-
-                    self.stats.all_checks += 1
-
-                    if self.stats.earliest_ever_time is None or earliest_time < self.stats.earliest_ever_time:
-                        self.stats.earliest_ever_time = earliest_time
-                        self.stats.current_earliest_time = earliest_time
-                        self.stats.last_found_time = earliest_time
-                    elif self.stats.last_found_time is None or earliest_time < self.stats.last_found_time:
-                        self.stats.last_found_time = earliest_time
-                        self.stats.current_earliest_time = earliest_time
-                    else:
-                        self.stats.last_found_time = earliest_time
-
-                    df_dt = datetime.strptime(self.cfg.date_from, "%Y-%m-%d")
-                    dt_dt = datetime.strptime(self.cfg.date_to, "%Y-%m-%d")
-                    hf = datetime.strptime(self.cfg.hour_from, "%H:%M").time()
-                    ht = datetime.strptime(self.cfg.hour_to, "%H:%M").time()
-
-                    earliest_matching_exam = None
-
-                    for exam in exams:
-                        if (
-                            df_dt <= exam.date <= dt_dt and
-                            hf <= exam.date.time() <= ht
-                        ):
-                            if earliest_matching_exam is None or exam.date < earliest_matching_exam.date:
-                                earliest_matching_exam = exam
-
-                    if earliest_matching_exam is not None:
-                        self.running = False
-                        self.app.call_from_thread(
-                            self.app.switch_screen,
-                            RescheduleScreen(
-                                session=self.session,
-                                reservation=self.reservation,
-                                new_exam=earliest_matching_exam,
-                            ),
-                        )
-                        playsound3.playsound("alert.mp3", False)
-
-                    self.app.call_from_thread(self.update_panels)
-                    self.app.call_from_thread(self.last_error_panel.update, "")
-                except Exception as e:
-                    self.app.call_from_thread(self.last_error_panel.update, f"[red]{str(e)}[/red]")
-
-                time.sleep(15)
-        finally:
-            self.running = False
+    def action_toggle_timings(self) -> None:
+        self.timings.toggle_class("hidden")
+        self.update_panels()
 
-    def update_panels(self) -> None:
-        turn_panel: StatPanel = self.query_one("#turnstile")
-        all_checks_panel: StatPanel = self.query_one("#all_checks")
-        earliest_ever_panel: StatPanel = self.query_one("#earliest_ever")
-        current_earliest_panel: StatPanel = self.query_one("#current_earliest")
-        last_found_panel: StatPanel = self.query_one("#last_found")
-
-        turn_panel.update_value(
-            f"{self.session.turnstile_solve_count} (~${self.session.turnstile_solve_count * 1.2 / 1000:.3f})"
-        )
-        all_checks_panel.update_value(str(self.stats.all_checks))
-        earliest_ever_panel.update_value(
-            self.stats.earliest_ever_time.strftime("%Y-%m-%d %H:%M")
-            if self.stats.earliest_ever_time is not None
-            else "-"
-        )
-        current_earliest_panel.update_value(
-            self.stats.current_earliest_time.strftime("%Y-%m-%d %H:%M")
-            if self.stats.current_earliest_time is not None
-            else "-"
-        )
-        last_found_panel.update_value(
-            self.stats.last_found_time.strftime("%Y-%m-%d %H:%M")
-            if self.stats.last_found_time is not None
-            else "-"
+    def apply_config(self, cfg: AppConfig) -> None:
+        """Switch the running search to the preferences in ``cfg``; costs no requests.
+
+        Stats and slot history are kept. Account fields only take effect on the next login.
+        """
+        app_state: AppState = getattr(self.app, "state")
+        self.cfg = cfg
+        app_state.cfg = cfg
+        self.slot_filter = SlotFilter.from_config(cfg)
+        self.search_dates.update(self._dates_text())
+        self.search_hours.update(self._hours_text())
+        if app_state.notifier is not None:
+            app_state.notifier.close(timeout=0)
+        app_state.notifier = Notifier.from_config(cfg)
+        self.last_error_panel.update("")
+        self.ticker_text.update("Search preferences reloaded")
+        # May find a match among the slots open right now and leave this screen
+        if self.engine is not None:
+            self.engine.set_filter(self.slot_filter)
+
+    def on_poll_update(self, events) -> None:
+        self.update_panels()
+        self.last_error_panel.update("")
+
+    def on_poll_error(self, error: Exception) -> None:
+        self.last_error_panel.update(f"[red]{str(error)}[/red]")
+
+    def on_poll_match(self, exam) -> None:
+        self.app.switch_screen(
+            RescheduleScreen(
+                session=self.session,
+                reservation=self.reservation,
+                new_exam=exam,
+            ),
         )
+        app_state: AppState = getattr(self.app, "state")
+        if app_state.notifier is not None:
+            app_state.notifier.notify(Notification(
+                "Exam slot found",
+                f"Rescheduling to {exam.date.strftime('%Y-%m-%d %H:%M')}",
+                kind="match",
+                data={"exam_id": exam.id, "date": exam.dateStr},
+            ))
+
+    def on_poll_auth_error(self, error) -> None:
+        # Lazy import to avoid circular import at module load time
+        from screens.login_screen import LoginScreen
+        self.app.switch_screen(LoginScreen(auto_login=True))
+
+    def update_panels(self) -> None:
+        # StatPanel values are reactive, so unchanged ones are not redrawn
+        solves = self.session.turnstile_solve_count
+        self.turnstile_panel.value = f"{solves} (~${solves * 1.2 / 1000:.3f})"
+        self.all_checks_panel.value = str(self.stats.all_checks)
+        self.earliest_ever_panel.value = self._format_date(self.stats.earliest_ever_time)
+        self.current_earliest_panel.value = self._format_date(self.stats.current_earliest_time)
+        self.last_found_panel.value = self._format_date(self.stats.last_found_time)
+        self.trend.update_trend(self.stats.trend)
+        if not self.timings.has_class("hidden"):
+            self.timings.update_metrics(self.session.metrics)
+
+    def _dates_text(self) -> str:
+        return f"Searching dates: {self.cfg.date_from} → {self.cfg.date_to}"
+
+    def _hours_text(self) -> str:
+        return f"Searching hours: {self.cfg.hour_from} → {self.cfg.hour_to}"
+
+    @staticmethod
+    def _format_date(dt: datetime | None) -> str:
+        return dt.strftime("%Y-%m-%d %H:%M") if dt is not None else "-"
+
+    def _tick(self) -> None:
+        self.elapsed = self._compute_elapsed_text_safe()
+        self._ticks += 1
+        if self._ticks % TICKER_TICKS == 0:
+            self.ticker_text.update(random.choice(FUNNY_TICKER_WAITING_TEXTS))
+        self._check_config()
+
+    def _check_config(self) -> None:
+        try:
+            cfg = self.config_watcher.poll() if self.config_watcher is not None else None
+        except ValueError as e:
+            self.last_error_panel.update(f"[red]config.json not applied: {e}[/red]")
+            return
+        if cfg is not None:
+            self.apply_config(cfg)
+
+    def watch_elapsed(self, elapsed: str) -> None:
+        self.searching_for.update(f"Searching for {elapsed}")
 
     def _compute_elapsed_text_safe(self) -> str:
         """Compute short elapsed time like '5m' or '3h10m' since checking started."""
@@ -290,13 +318,6 @@ class MainScreen(Screen):
         except Exception:
             return "0m"
 
-    def _update_elapsed_banner(self) -> None:
-        try:
-            elapsed = self._compute_elapsed_text_safe()
-            self.query_one("#searching_for", Static).update(f"Searching for ({elapsed})")
-        except Exception:
-            pass
-
     @staticmethod
     def _format_timedelta_short(td: timedelta) -> str:
         total = int(td.total_seconds())
@@ -7,9 +7,9 @@ from textual.widgets import Static, Label
 
 from datetime import datetime
 import time
-import threading
 
 from infocar import InfoCarSession
+from notifications import Notification
 from widgets.spinner import Spinner
 
 class RescheduleScreen(Screen):
@@ -92,10 +92,10 @@ class RescheduleScreen(Screen):
         self.error_panel = self.query_one("#error_panel")
         self.ticker_text.update("Rescheduling exam...")
 
-        def do_reschedule():
+        async def do_reschedule():
             try:
                 reservation_id = self.reservation['id']
-                self.session.reschedule_exam(reservation_id, self.new_exam.id)
+                await self.session.reschedule_exam(reservation_id, self.new_exam.id)
 
                 old_ts = time.strptime(self.reservation['exam']['practice']['date'], "%Y-%m-%dT%H:%M:%S")
                 old_date_str = time.strftime("%Y-%m-%d %H:%M", old_ts)
@@ -106,19 +106,26 @@ class RescheduleScreen(Screen):
                 saved_days = (old_dt - new_dt).days
                 saved_days = max(saved_days, 0)
 
-                def show_success():
-                    self.query_one("#details_line", Static).update("Check your email for details")
-                    self.query_one("#old_date", Static).update(f"Old date: {old_date_str}")
-                    self.query_one("#new_date", Static).update(f"New date: {new_date_str}")
-                    self.query_one("#saving_line", Static).update(f"With us you are saving {saved_days} days")
-
                 ticker_container.add_class("hidden")
 
-                self.app.call_from_thread(show_success)
+                self.query_one("#details_line", Static).update("Check your email for details")
+                self.query_one("#old_date", Static).update(f"Old date: {old_date_str}")
+                self.query_one("#new_date", Static).update(f"New date: {new_date_str}")
+                self.query_one("#saving_line", Static).update(f"With us you are saving {saved_days} days")
+                self._notify(Notification(
+                    "Exam rescheduled",
+                    f"New date: {new_date_str} (was {old_date_str})",
+                    kind="rescheduled",
+                    data={"exam_id": self.new_exam.id, "date": self.new_exam.dateStr, "old_date": self.reservation['exam']['practice']['date']},
+                ))
             except Exception as e:
-                def show_error():
-                    self.ticker_text.update("Failed to reschedule an exam.")
-                    self.error_panel.update(f"[red]{str(e)}[/red]")
-                self.app.call_from_thread(show_error)
+                self.ticker_text.update("Failed to reschedule an exam.")
+                self.error_panel.update(f"[red]{str(e)}[/red]")
+                self._notify(Notification("Failed to reschedule an exam", str(e), kind="reschedule_failed"))
+
+        self.run_worker(do_reschedule(), name="reschedule", group="reschedule", exclusive=True)
 
-        threading.Thread(target=do_reschedule, daemon=True).start()
+    def _notify(self, notification: Notification) -> None:
+        notifier = getattr(getattr(self.app, "state", None), "notifier", None)
+        if notifier is not None:
+            notifier.notify(notification)
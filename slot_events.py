@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Optional, Union
+
+from exam_schedule import Exam, Schedule, to_datetime, to_key
+
+
+@dataclass(frozen=True, slots=True)
+class SlotAppeared:
+    id: str
+    key: int
+    places: int
+    amount: int
+
+    @property
+    def date(self) -> datetime:
+        return to_datetime(self.key)
+
+    def to_exam(self) -> Exam:
+        dt = self.date
+        return Exam(id=self.id, places=self.places, dateStr=dt.isoformat(), date=dt, amount=self.amount)
+
+
+@dataclass(frozen=True, slots=True)
+class SlotDisappeared:
+    id: str
+    key: int
+
+    @property
+    def date(self) -> datetime:
+        return to_datetime(self.key)
+
+
+@dataclass(frozen=True, slots=True)
+class PlacesChanged:
+    id: str
+    key: int
+    before: int
+    after: int
+
+
+SlotEvent = Union[SlotAppeared, SlotDisappeared, PlacesChanged]
+
+
+def diff_schedules(previous: Optional[Schedule], current: Schedule) -> list[SlotEvent]:
+    """Events that turn ``previous`` into ``current``, in date order of each kind."""
+    if previous is current:
+        return []
+
+    events: list[SlotEvent] = []
+    prev_index = previous.index() if previous is not None else {}
+
+    for i, slot_id in enumerate(current.ids):
+        j = prev_index.get(slot_id)
+        if j is None:
+            events.append(SlotAppeared(slot_id, current.keys[i], current.places[i], current.amounts[i]))
+        elif previous.places[j] != current.places[i]:
+            events.append(PlacesChanged(slot_id, current.keys[i], previous.places[j], current.places[i]))
+
+    if previous is not None:
+        cur_index = current.index()
+        for j, slot_id in enumerate(previous.ids):
+            if slot_id not in cur_index:
+                events.append(SlotDisappeared(slot_id, previous.keys[j]))
+
+    return events
+
+
+def _rows(schedules: list[Schedule], *parts: slice) -> Schedule:
+    """One schedule of the rows ``parts`` of each schedule in ``schedules``."""
+    ids, keys, places, amounts = [], [], [], []
+    for schedule in schedules:
+        for part in parts:
+            ids += schedule.ids[part]
+            keys += schedule.keys[part]
+            places += schedule.places[part]
+            amounts += schedule.amounts[part]
+    return Schedule.from_columns(ids, keys, places, amounts)
+
+
+def _day_key(day: date) -> int:
+    return to_key(datetime.combine(day, time.min))
+
+
+class ScheduleDiffer:
+    """Remembers the last schedule seen and turns each new one into a list of events.
+
+    A schedule may only cover some days (``span``: first and last day, inclusive). Slots
+    seen earlier on other days are not reported as gone; they are kept in ``outside``,
+    open as far as we know, until a schedule covers their day again or it is past.
+    """
+
+    def __init__(self) -> None:
+        self.previous: Optional[Schedule] = None
+        self.outside: Optional[Schedule] = None
+
+    def update(self, schedule: Schedule, span: Optional[tuple[date, date]] = None) -> list[SlotEvent]:
+        previous, outside = self.previous, self.outside
+        if span is None:
+            if outside is not None:
+                previous, outside = _rows([previous, outside], slice(None)), None
+        elif previous is not None:
+            lo = _day_key(span[0])
+            hi = max(lo, _day_key(span[1] + timedelta(days=1)))
+            now = to_key(datetime.now())
+            if self._moved(lo, hi, now):
+                known = _rows([previous, outside] if outside is not None else [previous], slice(None))
+                keys = known.keys
+                i, j = bisect_left(keys, lo), bisect_left(keys, hi)
+                # A slot that already took place cannot be booked: it is gone, covered or not
+                past = bisect_left(keys, now, 0, i)
+                previous = _rows([known], slice(0, past), slice(i, j))
+                outside = _rows([known], slice(past, i), slice(j, None))
+
+        events = diff_schedules(previous, schedule)
+        self.previous = schedule
+        self.outside = outside if outside else None
+        return events
+
+    def _moved(self, lo: int, hi: int, now: int) -> bool:
+        """Whether a slot known so far is in the wrong part for the span ``lo``..``hi``."""
+        keys = self.previous.keys
+        if keys and (keys[0] < lo or keys[-1] >= hi):
+            return True
+        if self.outside is None:
+            return False
+        keys = self.outside.keys
+        i = bisect_left(keys, lo)
+        return keys[0] < now or (i < len(keys) and keys[i] < hi)
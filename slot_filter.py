@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from datetime import date, datetime, timedelta
+from typing import Optional, Sequence, TYPE_CHECKING
+
+from exam_schedule import to_key
+
+if TYPE_CHECKING:
+    from config_manager import AppConfig
+
+WEEKDAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+
+
+def _parse_date(s: str) -> date:
+    return datetime.strptime(s, "%Y-%m-%d").date()
+
+
+def _parse_hour(s: str) -> int:
+    t = datetime.strptime(s, "%H:%M")
+    return t.hour * 3600 + t.minute * 60
+
+
+def _merge(ranges: list[tuple]) -> list[tuple]:
+    """Merge overlapping or touching inclusive ranges."""
+    merged: list[tuple] = []
+    for lo, hi in sorted(ranges):
+        if merged and lo <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], hi))
+        else:
+            merged.append((lo, hi))
+    return merged
+
+
+class SlotFilter:
+    """Search preferences compiled into a sorted list of acceptable time windows.
+
+    Every window is an inclusive ``(start, end)`` pair of schedule keys (see
+    ``exam_schedule.to_key``). Matching a schedule bisects its sorted keys for each
+    window, so its cost depends on the number of windows, not on the number of slots.
+    """
+
+    __slots__ = ("first_day", "last_day", "_starts", "_ends")
+
+    def __init__(
+        self,
+        date_ranges: list[tuple[date, date]],
+        hours: dict[int, list[tuple[int, int]]],
+        excluded_dates: Sequence[date] = (),
+    ) -> None:
+        excluded = set(excluded_dates)
+        starts = array("q")
+        ends = array("q")
+
+        merged = _merge(date_ranges)
+        self.first_day: Optional[date] = merged[0][0] if merged else None
+        self.last_day: Optional[date] = merged[-1][1] if merged else None
+
+        for first, last in merged:
+            day = first
+            while day <= last:
+                if day not in excluded:
+                    midnight = to_key(datetime(day.year, day.month, day.day))
+                    for lo, hi in hours.get(day.weekday(), ()):
+                        starts.append(midnight + lo)
+                        ends.append(midnight + hi)
+                day += timedelta(days=1)
+
+        self._starts = starts
+        self._ends = ends
+
+    @classmethod
+    def from_config(cls, cfg: "AppConfig") -> "SlotFilter":
+        """Compile the search window(s) of ``cfg``; raises ValueError on malformed values."""
+        date_ranges = [(_parse_date(cfg.date_from), _parse_date(cfg.date_to))]
+        for first, last in cfg.date_ranges:
+            date_ranges.append((_parse_date(first), _parse_date(last)))
+
+        default_hours = [(_parse_hour(cfg.hour_from), _parse_hour(cfg.hour_to))]
+        hours = {}
+        for weekday, name in enumerate(WEEKDAYS):
+            windows = cfg.weekday_hours.get(name)
+            if windows is None:
+                hours[weekday] = default_hours
+            else:
+                hours[weekday] = _merge([(_parse_hour(lo), _parse_hour(hi)) for lo, hi in windows])
+
+        unknown = set(cfg.weekday_hours) - set(WEEKDAYS)
+        if unknown:
+            raise ValueError(f"Unknown weekday(s) in weekday_hours: {', '.join(sorted(unknown))}")
+
+        for first, last in date_ranges:
+            if first > last:
+                raise ValueError(f"Date range {first} → {last} ends before it starts")
+        for weekday_windows in hours.values():
+            for lo, hi in weekday_windows:
+                if lo >= hi:
+                    raise ValueError("Hour windows must start before they end")
+
+        return cls(date_ranges, hours, [_parse_date(d) for d in cfg.excluded_dates])
+
+    def span(self) -> Optional[tuple[date, date]]:
+        """First and last day covered by the filter, or None if it can never match."""
+        if not self._starts:
+            return None
+        return self.first_day, self.last_day
+
+    def matches(self, key: int) -> bool:
+        i = bisect_left(self._ends, key)
+        return i < len(self._ends) and self._starts[i] <= key
+
+    def first_index(self, keys: Sequence[int]) -> Optional[int]:
+        """Index of the earliest key inside any window; ``keys`` must be sorted."""
+        n = len(keys)
+        if n == 0:
+            return None
+
+        starts, ends = self._starts, self._ends
+        i = 0
+        w = bisect_left(ends, keys[0])
+        while w < len(ends):
+            i = bisect_left(keys, starts[w], i)
+            if i == n:
+                return None
+            if keys[i] <= ends[w]:
+                return i
+            # Skip straight to the first window that can still contain keys[i]
+            w = bisect_left(ends, keys[i], w + 1)
+        return None
@@ -0,0 +1,76 @@
+import base64
+import json
+import math
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+TOKEN_CACHE_PATH = Path(".token_cache.json")
+
+# Tokens this close to expiry are not worth reusing
+EXPIRY_MARGIN = 60
+
+
+def jwt_expiry(token: str) -> Optional[float]:
+    """Read the ``exp`` claim of a JWT without verifying it."""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        exp = json.loads(base64.urlsafe_b64decode(payload)).get("exp")
+        return float(exp) if exp is not None else None
+    except Exception:
+        return None
+
+
+def load_token(username: str, path: Optional[Path] = None) -> Optional[str]:
+    """Cached access token for ``username``, if there is one that has not expired.
+
+    A cache file of the wrong shape counts as no cache and is removed.
+    """
+    p = path or TOKEN_CACHE_PATH
+    try:
+        data = json.loads(p.read_text(encoding="utf-8"))
+    except Exception:
+        return None
+
+    expires_at = data.get("expires_at") if isinstance(data, dict) else None
+    token = data.get("access_token") if isinstance(data, dict) else None
+    if (
+        not isinstance(expires_at, (int, float))
+        or isinstance(expires_at, bool)
+        or not math.isfinite(expires_at)
+        or not isinstance(token, str)
+    ):
+        clear_token(p)
+        return None
+
+    if data.get("username") != username:
+        return None
+    if expires_at - EXPIRY_MARGIN <= time.time():
+        return None
+    return token or None
+
+
+def save_token(username: str, token: str, path: Optional[Path] = None) -> None:
+    """Cache ``token`` (readable by the owner only); tokens without an expiry are not cached."""
+    expires_at = jwt_expiry(token)
+    if expires_at is None:
+        return
+
+    p = path or TOKEN_CACHE_PATH
+    tmp = p.with_name(p.name + ".tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    # The mode above only applies to new files, tighten a leftover one too
+    os.chmod(tmp, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump({"username": username, "access_token": token, "expires_at": expires_at}, f)
+    os.replace(tmp, p)
+
+
+def clear_token(path: Optional[Path] = None) -> None:
+    p = path or TOKEN_CACHE_PATH
+    try:
+        p.unlink()
+    except FileNotFoundError:
+        pass
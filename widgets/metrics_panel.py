@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from textual.widgets import Static
+
+from metrics import Metrics
+
+
+def _ms(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "-"
+    if seconds >= 10:
+        return f"{seconds:.0f}s"
+    if seconds >= 1:
+        return f"{seconds:.1f}s"
+    return f"{seconds * 1000:.0f}ms"
+
+
+def _size(n: int) -> str:
+    for unit in ("B", "KB", "MB"):
+        if n < 1024:
+            return f"{n:.0f}{unit}" if unit == "B" else f"{n:.1f}{unit}"
+        n /= 1024
+    return f"{n:.1f}GB"
+
+
+class MetricsPanel(Static):
+    """Per-endpoint request timings of the session, see ``metrics.Metrics``."""
+
+    DEFAULT_CSS = """
+        MetricsPanel {
+            width: 100%;
+            height: auto;
+            color: gray;
+        }
+    """
+
+    _text = ""
+
+    def update_metrics(self, metrics: Metrics) -> None:
+        lines = [f"{'request':<19}{'count':>6}{'p50':>7}{'p95':>7}{'errors':>7}"]
+        received = 0
+        for name, m in sorted(metrics.endpoints.items()):
+            received += m.bytes_received
+            lines.append(
+                f"{name:<19}{m.requests:>6}{_ms(m.latency.quantile(0.5)):>7}"
+                f"{_ms(m.latency.quantile(0.95)):>7}{m.failures:>7}"
+            )
+
+        schedule = metrics.endpoints.get("exam_schedule")
+        parse = _ms(schedule.parse.quantile(0.5)) if schedule is not None else "-"
+        lines.append(f"schedule parse p50 {parse} • received {_size(received)}")
+        text = "\n".join(lines)
+        if text != self._text:
+            self._text = text
+            self.update(text)
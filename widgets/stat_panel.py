@@ -3,6 +3,7 @@ from __future__ import annotations
 from textual.widgets import Static, Label
 from textual.containers import Horizontal
 from textual.app import ComposeResult
+from textual.reactive import reactive
 
 class StatPanel(Static):
     DEFAULT_CSS = """
@@ -22,19 +23,25 @@ class StatPanel(Static):
         }
     """
 
+    # Only the value label is redrawn, and only when the text actually changes
+    value: reactive[str] = reactive("-", repaint=False)
+
     def __init__(self, title: str, body: str = "-", id: str | None = None) -> None:
         super().__init__(id=id)
         self.title = title
-        self.init_text = body
+        self.set_reactive(StatPanel.value, body)
 
     def compose(self) -> ComposeResult:
-        self.value = Static(self.init_text, classes="val")
+        self.value_label = Static(self.value, classes="val")
 
         yield Horizontal(
             Label(self.title, classes="lbl"),
-            self.value,
+            self.value_label,
             classes="row",
         )
 
+    def watch_value(self, text: str) -> None:
+        self.value_label.update(text)
+
     def update_value(self, text: str) -> None:
-        self.value.update(text)
+        self.value = text
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from textual.app import ComposeResult
+from textual.containers import Horizontal
+from textual.widgets import Label, Sparkline, Static
+
+from ring_buffer import TrendHistory
+
+
+class TrendPanel(Static):
+    """Sparklines of the earliest open slot (lower is earlier) and of the open slot count."""
+
+    DEFAULT_CSS = """
+        TrendPanel {
+            height: auto;
+        }
+
+        TrendPanel .row {
+            width: 100%;
+            height: 1;
+        }
+
+        TrendPanel .lbl {
+            width: 30;
+            height: 1;
+        }
+
+        TrendPanel Sparkline {
+            width: 1fr;
+        }
+    """
+
+    def __init__(self, id: str | None = None) -> None:
+        super().__init__(id=id)
+        self._version = -1
+
+    def compose(self) -> ComposeResult:
+        self.earliest = Sparkline([], summary_function=min)
+        self.open_slots = Sparkline([], summary_function=max)
+
+        yield Horizontal(Label("Earliest date trend", classes="lbl"), self.earliest, classes="row")
+        yield Horizontal(Label("Open slots trend", classes="lbl"), self.open_slots, classes="row")
+
+    def update_trend(self, trend: TrendHistory) -> None:
+        if trend.version == self._version:
+            return
+        self._version = trend.version
+        width = max(1, self.earliest.size.width or 16)
+        self.earliest.data = trend.earliest_series(width)
+        self.open_slots.data = trend.open_slots_series(width)